@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Compare memory used by compact models and plain dict models."""
+from __future__ import print_function
+
+import json
+import sys
+import tracemalloc
+
+from termius.core.models.terminal import SshConfig
+
+
+class DictModel(dict):
+    """Model representation before compact models."""
+
+    def __getattr__(self, name):
+        """Get field from self."""
+        return self.get(name, None)
+
+
+def make_payloads(count):
+    """Create decoded payloads like ones pulled from cloud."""
+    return json.loads(json.dumps([
+        {'id': i, 'port': 2022, 'charset': 'UTF-8', 'remote_instance': {
+            'id': i, 'state': 'synced', 'updated_at': None,
+        }} for i in range(count)
+    ]))
+
+
+def make_dict_model(payload):
+    """Create dict model with nested remote instance."""
+    model = DictModel(payload)
+    model['remote_instance'] = DictModel(model['remote_instance'])
+    return model
+
+
+def measure(constructor, count):
+    """Return bytes allocated by models created from payloads."""
+    payloads = make_payloads(count)
+    tracemalloc.start()
+    try:
+        models = [constructor(i) for i in payloads]
+        return tracemalloc.get_traced_memory()[0], models
+    finally:
+        tracemalloc.stop()
+
+
+def main(count=10000):
+    """Print memory used by both model kinds."""
+    dict_size, _ = measure(make_dict_model, count)
+    compact_size, _ = measure(lambda i: SshConfig(**i), count)
+    print('{} models: dict {} bytes, compact {} bytes'.format(
+        count, dict_size, compact_size
+    ))
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:2]])
@@ -24,6 +24,12 @@ def completion_tests():
     sh('pytest tests/integration/completion/bash/')
 
 
+@task
+def benchmark():
+    """Compare memory used by compact and dict models."""
+    sh('python contrib/benchmarks/models_memory.py')
+
+
 @task
 def coverage():
     """Run test and collect coverage."""
@@ -15,6 +15,7 @@ requires = [
     'cryptography>=3.2; python_version >= "3.6"',
     'cryptography==3.2; python_version == "3.5" or python_version == "2.7"',
     'six>=1.10.0',
+    'ipaddress>=1.0.16; python_version == "2.7"',
     'ndg-httpsclient>=0.4.0',
     'pyopenssl>=0.15.1; python_version >= "3.6"',
     'pyopenssl>=0.15.1,<=19.1.0; python_version == "2.7" or python_version == "3.5"',
@@ -52,7 +53,9 @@ handlers = [
     'info = termius.handlers:InfoCommand',
     'connect = termius.handlers:ConnectCommand',
     'crypto = termius.cloud.commands:CryptoCommand',
-    'init = termius.handlers:InitCommand'
+    'init = termius.handlers:InitCommand',
+    'migrate-storage = termius.handlers:MigrateStorageCommand',
+    'gc = termius.handlers:GarbageCollectCommand',
 ]
 
 
@@ -16,13 +16,18 @@ from .core.signals import (
     post_create_instance,
     post_update_instance,
     post_delete_instance,
+    post_create_instances,
+    post_update_instances,
+    post_delete_instances,
     post_logout,
 )
 from .core.subscribers import (
     store_ssh_key, delete_ssh_key,
+    store_ssh_keys, delete_ssh_keys,
     clean_data
 )
 from .core.models.terminal import SshKey
+from .core.storage.collector import GarbageCollector
 
 
 # pylint: disable=too-few-public-methods
@@ -49,12 +54,35 @@ class TermiusApp(App):
         super(TermiusApp, self).configure_logging()
         logging.getLogger('requests').setLevel(logging.WARNING)
 
+    # pylint: disable=no-self-use,unused-argument
+    def clean_up(self, cmd, result, err):
+        """Collect garbage and report storage statistics."""
+        storage = getattr(cmd, 'storage', None)
+        if storage is None:
+            return
+        if err is None and self.is_auto_gc_enabled(cmd):
+            garbage = GarbageCollector(storage).collect().models
+            if garbage:
+                with storage:
+                    storage.delete_many(garbage)
+        storage.identity_map.report_stats()
+
+    # pylint: disable=no-self-use
+    def is_auto_gc_enabled(self, cmd):
+        """Check that orphaned entries are swept after every command."""
+        return cmd.config.get_safe(
+            'Storage', 'auto_gc', default='no'
+        ) == 'yes'
+
     # pylint: disable=no-self-use
     def configure_signals(self):
         """Bind subscribers to signals."""
         post_create_instance.connect(store_ssh_key, sender=SshKey)
         post_update_instance.connect(store_ssh_key, sender=SshKey)
         post_delete_instance.connect(delete_ssh_key, sender=SshKey)
+        post_create_instances.connect(store_ssh_keys, sender=SshKey)
+        post_update_instances.connect(store_ssh_keys, sender=SshKey)
+        post_delete_instances.connect(delete_ssh_keys, sender=SshKey)
 
         post_logout.connect(clean_data)
 
@@ -4,6 +4,7 @@ from logging import getLogger
 from .transformers.many import BulkTransformer
 from .transformers.single import SettingsTransformer
 from ...core.api import API
+from ...core.storage.sharing import SharedContentSplitter
 from ...account.managers import AccountManager
 
 
@@ -17,7 +18,7 @@ class CryptoController(object):
 
     # pylint: disable=no-self-use
     def _mutate_fields(self, model, mutator):
-        for i in model.crypto_fields:
+        for i in model.get_schema().crypto_fields:
             crypto_field = getattr(model, i)
             if crypto_field:
                 setattr(model, i, mutator(crypto_field))
@@ -69,13 +70,18 @@ class ApiController(object):
         self.account_manager.set_settings(model)
 
     def post_bulk(self):
-        """Send local instances."""
+        """Send local instances.
+
+        Not synced records shared by content are split before sending,
+        cloud keeps own ssh config and identity per referrer.
+        """
         mapped = self.mapping['bulk']
         model = {}
         model['last_synced'] = self.config.get(
             'CloudSynchronization', 'last_synced'
         )
         assert model['last_synced']
+        SharedContentSplitter(self.storage).split()
         out_model = self._post(mapped, model)
         self.config.set('CloudSynchronization', 'last_synced',
                         out_model['last_synced'])
@@ -2,7 +2,6 @@
 """Module with many then 1 entry transformers."""
 from collections import OrderedDict
 from ....core.exceptions import DoesNotExistException, SkipField
-from ....core.storage.strategies import SoftDeleteStrategy
 from ....core.models.terminal import (
     Host, Group,
     Tag, SshKey,
@@ -68,12 +67,14 @@ class SoftDeleteMixin(object):
 
     def delete_list(self, models):
         """Delete models from the storage and put it to deleted_set."""
-        for i in models:
-            self.soft_delete(i)
+        self.storage.delete_many([i for i in models if i.id])
+        self.get_delete_strategy().delete_many(
+            [i for i in models if not i.id]
+        )
 
     def get_delete_strategy(self):
-        """Create delete strategy."""
-        return SoftDeleteStrategy(self.storage)
+        """Return delete strategy of storage, it keeps delete sets."""
+        return self.storage.strategies.deleter
 
 
 class BulkTransformer(CryptoChildTransformerCreatorMixin,
@@ -155,17 +156,29 @@ class BulkTransformer(CryptoChildTransformerCreatorMixin,
         """Process dictionary list with tranformer.
 
         This returns 2-size tuple where the first item is saved model list and
-        second one is model list for soft delete.
+        second one is model list for soft delete. Models are saved in one
+        batch, but models related to the same set (like nested groups) are
+        saved one by one to find relations in storage.
         """
+        model_class = transformer.model_class
+        is_self_related = model_class in [
+            i.model for _, i in model_class.get_schema().fk_fields
+        ]
+        if is_self_related:
+            convert = transformer.to_model
+        else:
+            convert = transformer.to_unsaved_model
         bad_encrypted_models = []
         models = []
         for i in payload:
             try:
-                child_model = transformer.to_model(i)
+                child_model = convert(i)
             except DeletBadEncrypted as exception:
                 bad_encrypted_models.append(exception.model)
             else:
                 models.append(child_model)
+        if not is_self_related:
+            models = self.storage.save_many(models)
         return models, bad_encrypted_models
 
 
@@ -175,6 +188,11 @@ class DeleteSetsTransformer(GetPrimaryKeyTransformerMixin,
                             ManyTransformer):
     """Transformer for deleted_sets field."""
 
+    def __init__(self, **kwargs):
+        """Construct new transformer for delete sets."""
+        super(DeleteSetsTransformer, self).__init__(**kwargs)
+        self.sent_delete_sets = None
+
     @property
     def supported_models(self):
         """Return model tuple to sync."""
@@ -187,14 +205,21 @@ class DeleteSetsTransformer(GetPrimaryKeyTransformerMixin,
         return self.get_primary_key_transformer(model)
 
     def to_model(self, payload):
-        """Handle payload to local models and delete them completely."""
+        """Handle payload to local models and delete them completely.
+
+        Delete sets sent in request are acknowledged by server response, so
+        they are compacted too.
+        """
         model = self.soft_delete_entries(payload)
         self.storage.confirm_delete(payload)
+        if self.sent_delete_sets:
+            self.storage.confirm_delete(self.sent_delete_sets)
         return model
 
     def to_payload(self, model):
         """Retrieve local deleted_set."""
-        return self.get_delete_strategy().get_delete_sets()
+        self.sent_delete_sets = self.get_delete_strategy().get_delete_sets()
+        return self.sent_delete_sets
 
     def soft_delete_entries(self, payload):
         """Remove user data and add them to local delete_sets."""
@@ -49,9 +49,8 @@ class BulkPrimaryKeyTransformer(BulkEntryBaseTransformer):
             raise SkipField
 
         remote_instance_id = self.id_from_payload(payload)
-        model = self.storage.get(
-            self.model_class,
-            **{'remote_instance.id': remote_instance_id}
+        model = self.storage.get_by_remote_id(
+            self.model_class, remote_instance_id
         )
         return model
 
@@ -111,7 +110,7 @@ class BulkEntryTransformer(GetPrimaryKeyTransformerMixin,
     def serialize_field(self, payload, model, field, mapping):
         """Transform field to payload or skip."""
         try:
-            if field in model.fk_field_names():
+            if field in model.get_schema().fk_field_names:
                 payload[field] = self.serialize_related_field(
                     model, field, mapping
                 )
@@ -137,20 +136,18 @@ class BulkEntryTransformer(GetPrimaryKeyTransformerMixin,
 
     def update_model_fields(self, model, payload):
         """Update model's fields with payload."""
-        fk_fields = model.fk_field_names()
+        schema = model.get_schema()
         models_fields = {
-            i: payload[i]
-            for i, mapping in model.fields.items()
-            if i not in fk_fields
+            i: payload[i] for i in model.fields
+            if i not in schema.fk_field_names
         }
-        for i, mapping in model.fields.items():
-            if i in fk_fields:
-                try:
-                    models_fields[i] = self.render_relation_field(
-                        mapping, payload[i]
-                    )
-                except SkipField:
-                    models_fields.pop(i, None)
+        for i, mapping in schema.fk_fields:
+            try:
+                models_fields[i] = self.render_relation_field(
+                    mapping, payload[i]
+                )
+            except SkipField:
+                models_fields.pop(i, None)
         model.update(models_fields)
         model.remote_instance = self.create_remote_instance(payload)
         return model
@@ -158,13 +155,28 @@ class BulkEntryTransformer(GetPrimaryKeyTransformerMixin,
     def get_or_initialize_model(self, payload):
         """Get existed model or generate new one using payload."""
         try:
-            model = self.get_model(payload)
+            return self.get_model(payload)
         except DoesNotExistException:
             model = self.initialize_model()
 
-        model.id = payload.get('local_id', model.id)
+        model.id = self.get_local_id(payload)
         return model
 
+    def get_local_id(self, payload):
+        """Return local id of payload when it refers to not synced record.
+
+        Payload created on other device has id of that device, so it is
+        used only for local record which was sent but has no remote
+        instance yet, otherwise new id is generated on save.
+        """
+        identificator = payload.get('local_id')
+        records = identificator and self.storage.indexes.lookup(
+            self.model_class.set_name, 'id', identificator
+        )
+        if records and not records[0].get('remote_instance'):
+            return identificator
+        return None
+
     def get_model(self, payload):
         """Get model for payload."""
         return super(BulkEntryTransformer, self).to_model(payload)
@@ -196,13 +208,16 @@ class CryptoBulkEntryTransformer(BulkEntryTransformer):
         self.crypto_controller = crypto_controller
 
     def to_model(self, payload):
+        """Decrypt model after serialization and save it."""
+        return self.storage.save(self.to_unsaved_model(payload))
+
+    def to_unsaved_model(self, payload):
         """Decrypt model after serialization."""
         model = super(CryptoBulkEntryTransformer, self).to_model(payload)
         try:
-            descrypted_model = self.crypto_controller.decrypt(model)
+            return self.crypto_controller.decrypt(model)
         except self.crypto_controller.bad_encrypted_exception:
             raise DeletBadEncrypted(model)
-        return self.storage.save(descrypted_model)
 
     def to_payload(self, model):
         """Encrypt model before deserialization."""
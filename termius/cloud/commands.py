@@ -112,9 +112,7 @@ class FullCleanCommand(CloudSynchronizationCommand):
         """Remove all local and remote instances."""
         for model in self.supported_models:
             self.log.info('Start cleaning %s...', model)
-            instances = self.storage.get_all(model)
-            for i in instances:
-                self.storage.delete(i)
+            self.storage.truncate(model)
             self.log.info('Complete cleaning')
 
 
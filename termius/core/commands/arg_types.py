@@ -1,7 +1,76 @@
 # -*- coding: utf-8 -*-
 """Module keeps command arguments converters."""
+import re
+import shlex
+
+from ..storage.query import QueryOperator
 
 
 def boolean_yes_no(string):
     """Convert `"yes"`, `"no"` to boolean `True`, `False`."""
     return string == 'yes'
+
+
+def non_negative_int(string):
+    """Convert string to integer which is not less than zero."""
+    value = int(string)
+    if value < 0:
+        raise ValueError(string)
+    return value
+
+
+def query_condition(string):
+    """Convert `"FIELD OPERATOR VALUE"` to query lookup and value pair."""
+    try:
+        field, operator_name, value = shlex.split(string)
+    except ValueError:
+        raise ValueError(string)
+    if operator_name not in QueryOperator.operators:
+        raise ValueError(string)
+    lookup = '{}.{}'.format(field, operator_name)
+    try:
+        QueryOperator(lookup, value)
+    except re.error:
+        raise ValueError(string)
+    return lookup, value
+
+
+# Operators comparing value with field value, so value is converted to
+# field type, e.g. to compare `"ssh_config.port gt 22"` as numbers.
+COERCED_OPERATORS = frozenset(('eq', 'ne', 'gt', 'lt', 'le', 'ge'))
+VALUE_CONVERTERS = {int: int, float: float, bool: boolean_yes_no}
+
+
+def get_field_type(model_class, field):
+    """Get type of dotted field path or None when type is unknown."""
+    value_type = model_class
+    for name in field.split('.'):
+        if not hasattr(value_type, 'get_schema'):
+            return None
+        schema_field = value_type.get_schema().fields.get(name)
+        if not schema_field:
+            return None
+        value_type = schema_field.model
+    return value_type
+
+
+def coerce_query_value(model_class, lookup, value):
+    """Convert query value to type of model field compared with it."""
+    field, operator_name = lookup.rsplit('.', 1)
+    if operator_name not in COERCED_OPERATORS:
+        return value
+    converter = VALUE_CONVERTERS.get(get_field_type(model_class, field))
+    return converter(value) if converter else value
+
+
+def typed_query_condition(model_class):
+    """Create query condition converter with values typed by model fields."""
+    def query_condition_converter(string):
+        """Convert `"FIELD OPERATOR VALUE"` with value of field type."""
+        lookup, value = query_condition(string)
+        try:
+            return lookup, coerce_query_value(model_class, lookup, value)
+        except ValueError:
+            raise ValueError(string)
+    query_condition_converter.__name__ = 'query_condition'
+    return query_condition_converter
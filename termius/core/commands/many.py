@@ -14,5 +14,5 @@ class ListCommand(GetRelationMixin, PrepareResultMixin,
     # pylint: disable=unused-argument
     def take_action(self, parsed_args):
         """Process CLI call."""
-        instances = self.storage.get_all(self.model_class)
+        instances = self.storage.query(self.model_class)
         return self.prepare_result(instances)
@@ -2,6 +2,7 @@
 """Module with different CLI commands mixins."""
 import getpass
 import os
+from collections import namedtuple
 from operator import attrgetter
 from functools import partial
 from cached_property import cached_property
@@ -9,7 +10,9 @@ from ..exceptions import (
     DoesNotExistException, ArgumentRequiredException,
     TooManyEntriesException, SkipField
 )
-from ..models.terminal import SshConfig, Identity
+from ..models.terminal import SshConfig, Identity, Group, Host
+from ..storage.results import ResultSet, ordering_key
+from .arg_types import non_negative_int
 from .utils import parse_ids_names, DefaultAttrGetter
 from ..models.utils import GroupStackGenerator, Merger
 
@@ -68,6 +71,43 @@ class GetRelationMixin(object):
         return self.get_safely_instance(model, value)
 
 
+class PaginateMixin(object):
+    """Mixin with arguments to order and page instance list."""
+
+    # pylint: disable=no-self-use
+    def add_pagination_arguments(self, parser):
+        """Add ordering, offset and limit arguments to parser."""
+        parser.add_argument(
+            '--order-by', metavar='FIELD',
+            help='order by FIELD, use --order-by=-FIELD for descending order'
+        )
+        parser.add_argument(
+            '--offset', metavar='N', type=non_negative_int, default=0,
+            help='skip first N entries'
+        )
+        parser.add_argument(
+            '--limit', metavar='N', type=non_negative_int,
+            help='list at most N entries'
+        )
+        return parser
+
+    # pylint: disable=no-self-use
+    def paginate(self, instances, args):
+        """Order and page result set or instance list."""
+        if isinstance(instances, ResultSet):
+            if args.order_by:
+                instances = instances.order_by(args.order_by)
+            instances = instances.offset(args.offset)
+            if args.limit is not None:
+                instances = instances.limit(args.limit)
+            return instances
+        if args.order_by:
+            key, reverse = ordering_key(args.order_by)
+            instances = sorted(instances, key=key, reverse=reverse)
+        stop = None if args.limit is None else args.offset + args.limit
+        return instances[args.offset:stop]
+
+
 class PrepareResultMixin(object):
     """Mixin with method to transform dict-list to 2-size tuple."""
 
@@ -243,50 +283,98 @@ class GroupStackGetterMixin(object):
         stack_generator = GroupStackGenerator(instance)
         return stack_generator.generate()
 
+    def get_group_tree(self):
+        """Return tree of stored group ids."""
+        return self.storage.indexes.get_closure(
+            Group.set_name, 'parent_group'
+        )
+
+
+def merge_entries(field, initial, entry, merged_parent_entry):
+    """Merge entry over already merged parent entries into initial."""
+    entries = [entry]
+    if merged_parent_entry:
+        entries.append(merged_parent_entry)
+    return Merger([], field, initial).merge_entries(entries)
+
+
+MergedStack = namedtuple(
+    'MergedStack', ('ssh_config', 'visible_identity', 'identity')
+)
+EMPTY_MERGED_STACK = MergedStack(None, None, None)
+
 
 class SshConfigMergerMixin(GroupStackGetterMixin, object):
-    """Mixin to squash (aka merge) stack to single ssh config."""
+    """Mixin to squash (aka merge) stack to single ssh config.
+
+    Merged stacks of stored groups are computed once from the top of group
+    tree and kept in storage identity map, so they are dropped on any
+    storage change.
+    """
+
+    merged_stack_view = 'merged_ssh_config'
 
     def get_merged_ssh_config(self, instance):
         """Get merged ssh config instance for instance.
 
         :param instance: Host or Group instance.
         """
-        group_stack = self.get_group_stack(instance)
-        full_stack = [instance] + group_stack
-        return self.merge_ssh_config(full_stack)
-
-    def merge_ssh_config(self, full_stack):
-        """Squash full_stack to single ssh_config instance."""
-        ssh_config_merger = self.get_ssh_config_merger(full_stack)
-        identity_merger = self.get_identity_merger(ssh_config_merger)
-        ssh_config = ssh_config_merger.merge()
-        visible_identity = self.get_visible_identity(ssh_config_merger)
-        if visible_identity:
-            ssh_config.identity = visible_identity
+        if isinstance(instance, Host):
+            parent_group = instance.group
         else:
-            ssh_config.identity = identity_merger.merge()
-        return ssh_config
-
-    # pylint: disable=no-self-use
-    def get_ssh_config_merger(self, stack):
-        """Create ssh config merger for passed stack."""
-        return Merger(stack, 'ssh_config', SshConfig())
+            parent_group = instance.parent_group
+        merged_stack = self.push_merged_stack(
+            instance.ssh_config, self.get_group_merged_stack(parent_group)
+        )
+        return self.render_merged_stack(merged_stack)
+
+    def get_group_merged_stack(self, group):
+        """Return merged stack of group and its parent groups."""
+        if not group:
+            return EMPTY_MERGED_STACK
+        identity_map = self.get_identity_map()
+        merged_stack = identity_map and group.id and identity_map.get_view(
+            self.merged_stack_view, group.id
+        )
+        if not merged_stack:
+            merged_stack = self.push_merged_stack(
+                group.ssh_config,
+                self.get_group_merged_stack(group.parent_group)
+            )
+            if identity_map and group.id:
+                identity_map.add_view(
+                    self.merged_stack_view, group.id, merged_stack
+                )
+        return merged_stack
+
+    def get_identity_map(self):
+        """Return storage identity map or None for mixin without storage."""
+        storage = getattr(self, 'storage', None)
+        return storage and storage.identity_map
 
     # pylint: disable=no-self-use
-    def get_visible_identity(self, ssh_config_merger):
-        """Return first of visible identity."""
-        stack = [
-            i.identity for i in ssh_config_merger.get_entry_stack()
-            if i.identity and i.identity.get('is_visible')
-        ]
-        return stack[0] if stack else None
+    def push_merged_stack(self, ssh_config, parent_stack):
+        """Merge ssh config over already merged parent stack."""
+        if not ssh_config:
+            return parent_stack
+        merged_stack = parent_stack._replace(ssh_config=merge_entries(
+            'ssh_config', SshConfig(), ssh_config, parent_stack.ssh_config
+        ))
+        identity = ssh_config.identity
+        if not identity:
+            return merged_stack
+        if identity.get('is_visible'):
+            return merged_stack._replace(visible_identity=identity)
+        return merged_stack._replace(identity=merge_entries(
+            'identity', Identity(), identity, parent_stack.identity
+        ))
 
     # pylint: disable=no-self-use
-    def get_identity_merger(self, ssh_config_merger):
-        """Create identity merger for passed merger."""
-        stack = [
-            i for i in ssh_config_merger.get_entry_stack()
-            if i.identity and not i.identity.get('is_visible')
-        ]
-        return Merger(stack, 'identity', Identity())
+    def render_merged_stack(self, merged_stack):
+        """Create new ssh config instance from merged stack."""
+        ssh_config = (merged_stack.ssh_config or SshConfig()).copy()
+        if merged_stack.visible_identity:
+            ssh_config.identity = merged_stack.visible_identity
+        else:
+            ssh_config.identity = (merged_stack.identity or Identity()).copy()
+        return ssh_config
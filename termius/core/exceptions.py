@@ -14,6 +14,14 @@ class TooManyEntriesException(TermiusException):
     """Raise it when there are more models then you think."""
 
 
+class RestrictedDeleteException(TermiusException):
+    """Raise it when model is referred by models restricting delete."""
+
+
+class UniqueConstraintException(TermiusException):
+    """Raise it when model has the same unique fields as stored one."""
+
+
 class ArgumentRequiredException(ValueError):
     """Raise it when one of required CLI argument is missed."""
 
@@ -3,27 +3,123 @@
 import copy
 from collections import namedtuple
 
-
-Field = namedtuple('Field', ('model', 'many', 'default'))
+from six.moves import intern
+
+
+Field = namedtuple('Field', ('model', 'many', 'default', 'on_delete'))
+Field.__new__.__defaults__ = (None,)
+
+# Policies of relation field when related model is deleted.
+CASCADE = 'cascade'
+RESTRICT = 'restrict'
+SET_NULL = 'set_null'
+
+ModelSchema = namedtuple('ModelSchema', (
+    'fields', 'field_names', 'field_name_set', 'fk_fields',
+    'fk_field_names', 'crypto_fields', 'mergable_fields', 'defaults',
+    'content_fields', 'unique_together',
+))
+
+_SCHEMAS = {}
+_REFERRERS = {}
+
+
+def intern_value(value):
+    """Return shared instance of equal string value.
+
+    Interned strings are released when no model refers them anymore,
+    unicode strings of python 2 are kept as is.
+    """
+    if isinstance(value, str):
+        return intern(value)
+    return value
+
+
+def make_schema(model_class):
+    """Compute field schema of model class."""
+    fields = model_class.fields.copy()
+    # pylint: disable=protected-access
+    fields.update(model_class._mandatory_fields)
+    fk_fields = tuple(
+        (k, v) for k, v in fields.items() if issubclass(v.model, Model)
+    )
+    mergable_fields = frozenset(getattr(model_class, 'mergable_fields', ()))
+    return ModelSchema(
+        fields=fields,
+        field_names=tuple(fields),
+        field_name_set=frozenset(fields),
+        fk_fields=fk_fields,
+        fk_field_names=tuple(k for k, _ in fk_fields),
+        crypto_fields=frozenset(getattr(model_class, 'crypto_fields', ())),
+        mergable_fields=mergable_fields,
+        defaults={k: v.default for k, v in fields.items()},
+        content_fields=tuple(
+            (k, fields[k].default) for k in sorted(mergable_fields)
+        ),
+        unique_together=tuple(
+            tuple((k, None) for k in i)
+            for i in getattr(model_class, 'unique_together', ())
+        ),
+    )
+
+
+def get_referrer_fields(model_class):
+    """Return (model class, field name, field) list referring model class.
+
+    Every stored model class (with set name) is inspected once.
+    """
+    if not _REFERRERS:
+        stack = [Model]
+        while stack:
+            referrer_class = stack.pop()
+            stack.extend(referrer_class.__subclasses__())
+            if not getattr(referrer_class, 'set_name', None):
+                continue
+            for name, field in referrer_class.get_schema().fk_fields:
+                _REFERRERS.setdefault(field.model, []).append(
+                    (referrer_class, name, field)
+                )
+    return _REFERRERS.get(model_class, ())
 
 
 class AbstractModel(dict):
-    """Base class for all models."""
+    """Base class for all models.
+
+    Models are dicts with empty slots: fields are kept as dictionary items
+    and instances have no __dict__, they are not fixed-slot records. Values
+    of interned fields are shared between models.
+    """
+
+    __slots__ = ()
 
     fields = dict()
     _mandatory_fields = dict()
+    interned_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        """Create new model and intern repeated field values."""
+        super(AbstractModel, self).__init__(*args, **kwargs)
+        for i in self.interned_fields:
+            value = self.get(i)
+            if value is not None:
+                self[i] = intern_value(value)
+
+    @classmethod
+    def get_schema(cls):
+        """Return field schema of model class, it is computed once."""
+        schema = _SCHEMAS.get(cls)
+        if schema is None:
+            schema = _SCHEMAS[cls] = make_schema(cls)
+        return schema
 
     @classmethod
     def _fields(cls):
-        copy_fields = cls.fields.copy()
-        copy_mandatory_fields = cls._mandatory_fields.copy()
-        copy_fields.update(copy_mandatory_fields)
-        return copy_fields
+        return cls.get_schema().fields.copy()
 
     @classmethod
     def allowed_fields(cls):
         """Return list of fields for application usage."""
-        return cls._fields().keys()
+        return cls.get_schema().field_names
 
     def __getattr__(self, name):
         """Get field from self."""
@@ -56,22 +152,27 @@ class AbstractModel(dict):
 class RemoteInstance(AbstractModel):
     """Class that represent model sync revision."""
 
+    __slots__ = ()
+
     fields = {
         'id': Field(int, False, None),
         # States could be one of 'created' / 'updated' / 'synced'
         'state': Field(str, False, 'synced'),
         'updated_at': Field(str, False, None),
     }
+    interned_fields = ('state',)
 
     def init_from_payload(self, response_payload):
         """Update remote instance field with response payload ones."""
-        for i, field in self.fields.items():
-            setattr(self, i, response_payload.pop(i, field.default))
+        for i, default in self.get_schema().defaults.items():
+            setattr(self, i, response_payload.pop(i, default))
 
 
 class Model(AbstractModel):
     """Base model with relations."""
 
+    __slots__ = ()
+
     _mandatory_fields = {
         'id': Field(int, False, None),
         'remote_instance': Field(RemoteInstance, False, None)
@@ -84,8 +185,9 @@ class Model(AbstractModel):
         self.remote_instance = None
 
         # Do not store extra fields for security reason
-        fields = self.__filter_fields(kwargs)
-        super(Model, self).__init__(*args, **fields)
+        if not self.get_schema().field_name_set.issuperset(kwargs):
+            kwargs = self.__filter_fields(kwargs)
+        super(Model, self).__init__(*args, **kwargs)
 
         is_need_to_patch_remote = (
             self.remote_instance and
@@ -96,14 +198,13 @@ class Model(AbstractModel):
 
     @classmethod
     def __filter_fields(cls, fields):
-        return {k: v for k, v in fields.items() if k in cls.allowed_fields()}
+        allowed_fields = cls.get_schema().field_name_set
+        return {k: v for k, v in fields.items() if k in allowed_fields}
 
     @classmethod
     def fk_field_names(cls):
         """Return name list for relation fields."""
-        return tuple(
-            k for k, v in cls._fields().items() if issubclass(v.model, Model)
-        )
+        return cls.get_schema().fk_field_names
 
     def mark_updated(self):
         """Mark revision as outdated."""
@@ -127,7 +228,13 @@ class Model(AbstractModel):
 
 
 class DeleteSets(AbstractModel):
-    """Class to keep deleted model remote references."""
+    """Class to keep deleted model remote references.
+
+    Ids are stored as lists, they are turned into sets on first change, so
+    adding and removing ids does not copy whole list.
+    """
+
+    __slots__ = ()
 
     fields = {
         'tag_set': Field(list, False, None),
@@ -145,30 +252,32 @@ class DeleteSets(AbstractModel):
     set_name = 'delete_sets'
     default_field_value = list
 
-    def update_field(self, field, set_operator):
-        """Update the one of deleted_set."""
-        existed = getattr(self, field) or self.default_field_value()
-        existed_set = set(existed)
-        new_set = set_operator(existed_set)
-        new = self.default_field_value(new_set)
-        setattr(self, field, new)
+    def get_set(self, field):
+        """Return ids of field as set, list is converted once."""
+        value = self.get(field)
+        if not isinstance(value, set):
+            value = self[field] = set(value or ())
+        return value
 
     def store(self, model):
         """Add model id to deleted_sets."""
-        if not model.remote_instance:
-            return
-
-        def union(existed_set):
-            return existed_set.union({model.remote_instance.id})
+        self.store_many([model])
 
-        self.update_field(model.set_name, union)
+    def store_many(self, models):
+        """Add ids of models to deleted_sets."""
+        for i in models:
+            if i.remote_instance:
+                self.get_set(i.set_name).add(i.remote_instance.id)
 
     def remove_all(self, set_name, identities):
         """Remove id from deleted_sets."""
         if not identities:
             return
-
-        def intersection(existed_set):
-            return existed_set - set(identities)
-
-        self.update_field(set_name, intersection)
+        self.get_set(set_name).difference_update(identities)
+
+    def serialize(self):
+        """Return copy with sorted id lists to store or send it."""
+        return type(self)({
+            k: self.default_field_value(sorted(v)) if isinstance(v, set)
+            else v for k, v in self.items()
+        })
@@ -2,22 +2,27 @@
 """Module with user data models."""
 from datetime import datetime
 from operator import attrgetter
-from .base import Model, Field
+from .base import Model, Field, CASCADE, SET_NULL
 
 
 class Tag(Model):
     """Model for tag."""
 
+    __slots__ = ()
+
     fields = {
         'label': Field(str, False, '')
     }
     set_name = 'tag_set'
     crypto_fields = fields
+    unique_together = (('label',),)
 
 
 class Snippet(Model):
     """Model for snippet."""
 
+    __slots__ = ()
+
     fields = {
         'label': Field(str, False, ''),
         'script': Field(str, False, ''),
@@ -29,6 +34,8 @@ class Snippet(Model):
 class SshKey(Model):
     """Model for ssh key."""
 
+    __slots__ = ()
+
     fields = {
         'label': Field(str, False, ''),
         'private_key': Field(str, False, ''),
@@ -36,6 +43,7 @@ class SshKey(Model):
     }
     set_name = 'sshkeycrypt_set'
     crypto_fields = fields
+    unique_together = (('label',),)
     file_mode = 0o600
 
     def file_path(self, command):
@@ -47,13 +55,16 @@ class SshKey(Model):
 class Identity(Model):
     """Model for identity."""
 
+    __slots__ = ()
+
     fields = {
         'label': Field(str, False, ''),
         'username': Field(str, False, ''),
         'is_visible': Field(str, False, False),
-        'ssh_key': Field(SshKey, False, None),
+        'ssh_key': Field(SshKey, False, None, SET_NULL),
     }
     mergable_fields = {'username', 'ssh_key'}
+    interned_fields = ('username',)
     set_name = 'identity_set'
     crypto_fields = {'label', 'username'}
 
@@ -61,10 +72,12 @@ class Identity(Model):
 class SshConfig(Model):
     """Model for ssh config."""
 
+    __slots__ = ()
+
     fields = {
         'port': Field(int, False, None),
-        'identity': Field(Identity, False, None),
-        'startup_snippet': Field(Snippet, False, None),
+        'identity': Field(Identity, False, None, SET_NULL),
+        'startup_snippet': Field(Snippet, False, None, SET_NULL),
         'strict_host_key_check': Field(bool, False, None),
         'use_ssh_key': Field(bool, False, None),
         'timeout': Field(int, False, None),
@@ -91,6 +104,7 @@ class SshConfig(Model):
         'charset',
         'cursor_blink',
     }
+    interned_fields = ('font_size', 'color_scheme', 'charset')
     set_name = 'sshconfig_set'
 
     def get_ssh_key(self):
@@ -138,16 +152,20 @@ class SshConfig(Model):
 class SshConfigMixin(object):
     """Mixin to easy and safely get ssh config field."""
 
+    __slots__ = ()
+
     def get_assign_ssh_config(self):
         """Get existed ssh config or create and assign new one."""
         ssh_config = self.ssh_config or SshConfig()
-        self.ssh_config = ssh_config
+        self['ssh_config'] = ssh_config
         return ssh_config
 
 
 class Group(SshConfigMixin, Model):
     """Model for group."""
 
+    __slots__ = ()
+
     fields = {
         'label': Field(str, False, ''),
         'ssh_config': Field(SshConfig, False, None),
@@ -156,21 +174,24 @@ class Group(SshConfigMixin, Model):
     crypto_fields = {'label', }
 
 
-Group.fields['parent_group'] = Field(Group, False, None)
+Group.fields['parent_group'] = Field(Group, False, None, SET_NULL)
 
 
 class Host(SshConfigMixin, Model):
     """Model for host."""
 
+    __slots__ = ()
+
     fields = {
         'label': Field(str, False, ''),
         'address': Field(str, False, ''),
-        'group': Field(Group, False, None),
+        'group': Field(Group, False, None, SET_NULL),
         'ssh_config': Field(SshConfig, False, None),
         'interaction_date': Field(str, False, None),
     }
     set_name = 'host_set'
     crypto_fields = {'label', 'address'}
+    unique_together = (('label', 'group'),)
 
     def update_interaction_date(self):
         """Set current UTC Time to interaction date."""
@@ -183,9 +204,11 @@ class Host(SshConfigMixin, Model):
 class TagHost(Model):
     """Model for relation host and tags."""
 
+    __slots__ = ()
+
     fields = {
-        'host': Field(Host, False, None),
-        'tag': Field(Tag, False, None),
+        'host': Field(Host, False, None, CASCADE),
+        'tag': Field(Tag, False, None, CASCADE),
     }
     set_name = 'taghost_set'
 
@@ -193,15 +216,18 @@ class TagHost(Model):
 class PFRule(Model):
     """Model for port forwarding."""
 
+    __slots__ = ()
+
     fields = {
         'label': Field(str, False, ''),
-        'host': Field(Host, False, None),
+        'host': Field(Host, False, None, CASCADE),
         'pf_type': Field(str, False, 'L'),
         'bound_address': Field(str, False, ''),
         'local_port': Field(int, False, 22),
         'hostname': Field(str, False, ''),
         'remote_port': Field(int, False, 22),
     }
+    interned_fields = ('pf_type', 'bound_address')
     set_name = 'pfrule_set'
     crypto_fields = {'label', 'hostname'}
 
@@ -221,10 +247,10 @@ class PFRule(Model):
 
 
 # pylint: disable=invalid-name
-clean_order = reversed((
+clean_order = tuple(reversed((
     SshKey, Snippet,
     Identity, SshConfig,
     Tag, Group,
     Host, PFRule,
     TagHost
-))
+)))
@@ -37,7 +37,7 @@ class Merger(object):
         """Construct new instance stack."""
         self.stack = stack
         self.stack_field = stack_field
-        self.merge_field_list = initial.mergable_fields
+        self.merge_field_list = initial.get_schema().mergable_fields
         self.stack_field_getter = attrgetter(stack_field)
         self.initial = initial
 
@@ -48,9 +48,11 @@ class Merger(object):
 
     def merge(self):
         """Merge instances of full_stack to single instance."""
-        entries = self.get_entry_stack()
-        merged = functools.reduce(self.reducer, entries, self.initial)
-        return merged
+        return self.merge_entries(self.get_entry_stack())
+
+    def merge_entries(self, entries):
+        """Merge entries to single instance."""
+        return functools.reduce(self.reducer, entries, self.initial)
 
     def reducer(self, accumulator, value):
         """Merge value fields to accumulator."""
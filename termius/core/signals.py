@@ -18,5 +18,20 @@ pre_delete_instance = signal('pre-delete-instance')
 # pylint: disable=invalid-name
 post_delete_instance = signal('post-delete-instance')
 
+# pylint: disable=invalid-name
+pre_create_instances = signal('pre-create-instances')
+# pylint: disable=invalid-name
+post_create_instances = signal('post-create-instances')
+
+# pylint: disable=invalid-name
+pre_update_instances = signal('pre-update-instances')
+# pylint: disable=invalid-name
+post_update_instances = signal('post-update-instances')
+
+# pylint: disable=invalid-name
+pre_delete_instances = signal('pre-delete-instances')
+# pylint: disable=invalid-name
+post_delete_instances = signal('post-delete-instances')
+
 # pylint: disable=invalid-name
 post_logout = signal('post_logout')
@@ -1,17 +1,26 @@
 # -*- coding: utf-8 -*-
 """Module for Application storage."""
 import logging
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 from ..signals import (
     pre_create_instance, post_create_instance,
     pre_update_instance, post_update_instance,
     pre_delete_instance, post_delete_instance,
+    pre_create_instances, post_create_instances,
+    pre_update_instances, post_update_instances,
+    pre_delete_instances, post_delete_instances,
 )
-from .idgenerators import UUIDGenerator
-from .driver import PersistentDict
+from .idgenerators import SequenceGenerator
+from .driver import (
+    PersistentDict, JournalPersistentDict, SectionedPersistentDict
+)
+from .sqlite import SQLitePersistentDict
+from .identity_map import IdentityMap
 from ..exceptions import DoesNotExistException, TooManyEntriesException
+from .constraints import Constraints
 from .strategies import SaveStrategy, GetStrategy, SoftDeleteStrategy
-from .query import Query
+from .planner import QueryPlanner
+from .results import ResultSet
 
 
 # pylint: disable=too-few-public-methods
@@ -43,11 +52,24 @@ class ModelContructor(InternalModelContructor):
 Strategies = namedtuple('Strategies', ('getter', 'saver', 'deleter'))
 
 
+# pylint: disable=too-many-public-methods
 class ApplicationStorage(object):
-    """Storage for user data."""
+    """Storage for user data.
+
+    Constraints, query planning, indexes and identity map are kept by
+    collaborators, storage methods delegating to them are thin.
+    """
 
     path = '{application_directory}/storage'
     defaultstorage = list
+    indexed_fields = ('id', 'remote_instance.id')
+    drivers = {
+        'json': PersistentDict,
+        'journal': JournalPersistentDict,
+        'sectioned': SectionedPersistentDict,
+        'sqlite': SQLitePersistentDict,
+    }
+    default_driver = 'json'
     logger = logging.getLogger(__name__)
 
     def __init__(self, command, save_strategy=None,
@@ -57,9 +79,13 @@ class ApplicationStorage(object):
             application_directory=command.app.directory_path, **kwargs
         )
         self._path = self.path.format(**paths_kwargs)
-        self.driver = PersistentDict(self._path)
-        self.id_generator = UUIDGenerator(self)
         self.command = command
+        self.driver = self._make_driver()
+        self.indexes = self._make_indexes()
+        self.identity_map = IdentityMap()
+        self.planner = QueryPlanner(self)
+        self.id_generator = SequenceGenerator(self)
+        self.constraints = Constraints(self)
 
         self.strategies = Strategies(
             self.make_strategy(get_strategy, GetStrategy),
@@ -78,26 +104,56 @@ class ApplicationStorage(object):
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Process transaction closing and sync driver."""
+        self.strategies.deleter.flush()
         self.driver.sync()
 
     def save(self, original_model):
         """Save model to storage.
 
-        Will return model with id and saved mapped fields Model
-        instances with ids.
+        Will return passed model updated with id, relation ids and remote
+        instance of stored record. Stored record is a copy of model, so
+        later changes of model fields do not change it. Unique constraints
+        are checked before any relation is written.
         """
+        self.constraints.validate_unique([original_model])
         model = self.strategies.saver.save(original_model)
         if getattr(model, model.id_name):
-            saved_model = self.update(model)
+            self.update(model)
         else:
-            saved_model = self.create(model)
-            original_model.id = model.id
+            self.create(model)
+        original_model.update(model)
+        return original_model
 
-        return saved_model
+    def save_many(self, original_models):
+        """Save model list to storage in one pass per set.
+
+        Signals are sent once per model class with instance list. Models
+        breaking unique constraints are skipped and keep no id, others are
+        saved.
+        """
+        original_models = self.constraints.skip_duplicates(original_models)
+        models = [self.strategies.saver.save(i) for i in original_models]
+        created = [i for i in models if not getattr(i, i.id_name)]
+        updated = [i for i in models if getattr(i, i.id_name)]
+
+        self._send_batch(pre_create_instances, created)
+        self._send_batch(pre_update_instances, updated)
+        self.id_generator.generate_many(created)
+        for i in updated:
+            self.strategies.saver.mark_model(i)
+        self._internal_update_many(created)
+        self._internal_replace_many(updated)
+        self._send_batch(post_create_instances, created)
+        self._send_batch(post_update_instances, updated)
+
+        for original_model, model in zip(original_models, models):
+            original_model.update(model)
+        return original_models
 
     def create(self, model):
         """Add new model in it's list."""
         assert not getattr(model, model.id_name)
+        self.constraints.validate_unique([model])
         pre_create_instance.send(
             model.__class__, command=self.command, instance=model
         )
@@ -112,20 +168,25 @@ class ApplicationStorage(object):
         """Update existed model in it's list."""
         identificator = getattr(model, model.id_name)
         assert identificator
+        self.constraints.validate_unique([model])
 
         pre_update_instance.send(
             model.__class__, command=self.command, instance=model
         )
-        self._internal_delete(model)
         self.strategies.saver.mark_model(model)
-        updated_model = self._internal_update(model)
+        self._internal_replace_many([model])
         post_update_instance.send(
             model.__class__, command=self.command, instance=model
         )
-        return updated_model
+        return model
 
     def delete(self, model):
-        """Delete model from it's list."""
+        """Delete model from it's list.
+
+        Models referring to model are deleted, updated or prevent deleting
+        according to on_delete policy of their relation fields.
+        """
+        self._apply_delete_policies([model])
         pre_delete_instance.send(
             model.__class__, command=self.command, instance=model
         )
@@ -135,6 +196,60 @@ class ApplicationStorage(object):
             model.__class__, command=self.command, instance=model
         )
 
+    def delete_many(self, models):
+        """Delete model list from storage in one pass per set.
+
+        Signals are sent once per model class with instance list.
+        """
+        self._apply_delete_policies(models)
+        self._delete_many(models)
+
+    def _delete_many(self, models):
+        self._send_batch(pre_delete_instances, models)
+        self._internal_delete_many(models)
+        self.strategies.deleter.delete_many(models)
+        self._send_batch(post_delete_instances, models)
+
+    def truncate(self, model_class, record_deletes=True):
+        """Delete all models of set in one operation.
+
+        Delete policies of relation fields are not applied, so sets
+        referring to model set should be truncated too. Signals are sent
+        once with instance list, remote ids are stored in delete sets only
+        when record_deletes is set.
+        """
+        models = self._internal_get_all(model_class)
+        self._send_batch(pre_delete_instances, models)
+        self.low_set(model_class.set_name, self.defaultstorage())
+        if record_deletes:
+            self.strategies.deleter.delete_many(models)
+        self._send_batch(post_delete_instances, models)
+        return models
+
+    def referrers(self, model):
+        """Return models referring to model through relation fields."""
+        return self.constraints.referrers(model)
+
+    def _apply_delete_policies(self, models):
+        updated, cascaded = self.constraints.resolve_delete(models)
+        for i in updated:
+            self.strategies.saver.mark_model(i)
+        if updated:
+            self._send_batch(pre_update_instances, updated)
+            self._internal_replace_many(updated)
+            self._send_batch(post_update_instances, updated)
+        if cascaded:
+            self._delete_many(cascaded)
+
+    def _send_batch(self, batch_signal, models):
+        per_class = OrderedDict()
+        for i in models:
+            per_class.setdefault(i.__class__, []).append(i)
+        for model_class, instances in per_class.items():
+            batch_signal.send(
+                model_class, command=self.command, instances=instances
+            )
+
     def confirm_delete(self, deleted_sets):
         """Remove intersection with deleted_sets from storage."""
         self.strategies.deleter.remove_intersection(deleted_sets)
@@ -152,12 +267,28 @@ class ApplicationStorage(object):
     def get_single_by_id(self, model_class, identificator):
         """Retrieve single entry by id from storage."""
         assert identificator
-        query = Query(all, id=identificator)
-        internal_models = self._internal_get_all(model_class)
-        founded_models = [i for i in internal_models if query(i)]
+        founded_models = self.indexes.lookup(
+            model_class.set_name, 'id', identificator
+        )
+        single_model = self._validate_the_single_model(founded_models)
+        return self.model_constructor(single_model, model_class)
+
+    def get_by_remote_id(self, model_class, remote_id):
+        """Retrieve single entry by remote instance id from storage."""
+        founded_models = self.indexes.lookup(
+            model_class.set_name, 'remote_instance.id', remote_id
+        )
         single_model = self._validate_the_single_model(founded_models)
         return self.model_constructor(single_model, model_class)
 
+    def get_by_unique(self, model_class, **kwargs):
+        """Retrieve single entry by values of unique together fields.
+
+        Usage:
+            tag = storage.get_by_unique(Tag, label='label')
+        """
+        return self.constraints.get_by_unique(model_class, **kwargs)
+
     def filter(self, model_class, query_union=None, **kwargs):
         """Filter the model list with passed lookups.
 
@@ -166,10 +297,8 @@ class ApplicationStorage(object):
         """
         assert isinstance(model_class, type)
         assert kwargs
-        query = Query(query_union, **kwargs)
-        models = self.get_all(model_class)
-        founded_models = [i for i in models if query(i)]
-        return founded_models
+        result_set = self.query(model_class).filter(query_union, **kwargs)
+        return list(result_set)
 
     def exclude(self, model_class, query_union=None, **kwargs):
         """Exclude the model list when matches the lookups.
@@ -179,10 +308,25 @@ class ApplicationStorage(object):
         """
         assert isinstance(model_class, type)
         assert kwargs
-        query = Query(query_union, **kwargs)
-        models = self.get_all(model_class)
-        founded_models = [i for i in models if not query(i)]
-        return founded_models
+        result_set = self.query(model_class).exclude(query_union, **kwargs)
+        return list(result_set)
+
+    def query(self, model_class):
+        """Return lazy result set of all models of class.
+
+        Usage:
+            result_set = storage.query(Model).filter(any, **lookups)
+            models = list(result_set.order_by('label').limit(10))
+        """
+        assert isinstance(model_class, type)
+        return ResultSet(self, model_class)
+
+    def select_records(self, model_class, query=None):
+        """Return raw records which could match query, all without it."""
+        if query is None:
+            return self._get_records(model_class.set_name)
+        plan = self.planner.plan(model_class, query)
+        return self.planner.execute(plan)
 
     def get_all(self, model_class):
         """Retrieve full model list."""
@@ -193,29 +337,76 @@ class ApplicationStorage(object):
 
     def _get_all_base(self, model_class, model_contructor):
         assert isinstance(model_class, type)
-        name = model_class.set_name
-        data = self.driver.setdefault(name, self.defaultstorage())
+        data = self._get_records(model_class.set_name)
         models = self.defaultstorage(
             (model_contructor(i, model_class) for i in data)
         )
         return models
 
+    def _get_records(self, set_name):
+        return self.driver.setdefault(set_name, self.defaultstorage())
+
     def _internal_update(self, model):
-        models = self._internal_get_all(type(model))
-        models.append(model)
-        self.driver[model.set_name] = models
+        self._internal_update_many([model])
         return model
 
+    def _internal_update_many(self, models):
+        for set_name, records in self._group_by_set(models).items():
+            self.driver.append_records(set_name, records)
+            for i in records:
+                self.indexes.add(set_name, i)
+        self.identity_map.clear()
+
+    def _internal_replace_many(self, models):
+        for set_name, set_models in self._group_by_set(models).items():
+            pairs, appended = self._pair_with_records(set_name, set_models)
+            self.driver.replace_records(set_name, pairs)
+            for old, new in pairs:
+                self.indexes.replace(set_name, old, new)
+            if appended:
+                self.driver.append_records(set_name, appended)
+                for i in appended:
+                    self.indexes.add(set_name, i)
+        self.identity_map.clear()
+
+    def _pair_with_records(self, set_name, models):
+        pairs = []
+        appended = []
+        for model in models:
+            founded_records = self.indexes.lookup(
+                set_name, model.id_name, getattr(model, model.id_name)
+            )
+            if founded_records:
+                pairs.append((founded_records[0], model))
+            else:
+                appended.append(model)
+        return pairs, appended
+
     def _internal_delete(self, model):
-        identificator = getattr(model, model.id_name)
-        assert identificator
+        self._internal_delete_many([model])
+
+    def _internal_delete_many(self, models):
+        for set_name, set_models in self._group_by_set(models).items():
+            records = []
+            for model in set_models:
+                identificator = getattr(model, model.id_name)
+                assert identificator
+                founded_records = self.indexes.lookup(
+                    set_name, model.id_name, identificator
+                )
+                if founded_records:
+                    records.append(founded_records[0])
+            self.driver.remove_records(set_name, records)
+            for i in records:
+                self.indexes.remove(set_name, i)
+        self.identity_map.clear()
 
-        models = self._internal_get_all(type(model))
-        for index, model_obj in enumerate(models):
-            if model_obj.id == identificator:
-                models.pop(index)
-                break
-        self.driver[model.set_name] = models
+    # pylint: disable=no-self-use
+    def _group_by_set(self, models):
+        per_set = OrderedDict()
+        for i in models:
+            per_set.setdefault(i.set_name, []).append(i)
+        return per_set
 
     def low_get(self, key):
         """Get data directly from driver."""
@@ -224,11 +415,44 @@ class ApplicationStorage(object):
     def low_set(self, key, value):
         """Set data directly to driver."""
         self.driver[key] = value
+        self.indexes.invalidate(key)
+        self.identity_map.clear()
 
     def generate_id(self, model):
         """Generate new local id."""
         return self.id_generator(model)
 
+    def migrate(self, driver_name):
+        """Copy all data to driver with passed name and switch to it."""
+        driver = self._make_driver(driver_name)
+        if driver.__class__ is self.driver.__class__:
+            return
+        self.strategies.deleter.flush()
+        self.driver.compact()
+        driver.clear()
+        for i in self.driver.stored_keys():
+            driver[i] = self.driver[i]
+        driver.compact()
+        self.driver = driver
+        self.indexes = self._make_indexes()
+        self.identity_map.clear()
+
+    def _make_driver(self, driver_name=None):
+        """Create driver chosen in config Storage section."""
+        driver_name = driver_name or self.command.config.get_safe(
+            'Storage', 'driver', default=self.default_driver
+        )
+        driver_class = self.drivers.get(
+            driver_name, self.drivers[self.default_driver]
+        )
+        return driver_class(self._path)
+
+    def _make_indexes(self):
+        """Create index registry suitable for driver."""
+        return self.driver.index_registry_class(
+            self.driver, self.indexed_fields
+        )
+
     def make_strategy(self, strategy_class, default):
         """Create new strategy."""
         strategy_class = strategy_class or default
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Module with garbage collector of orphaned storage records."""
+import json
+from collections import namedtuple
+
+from ..models.terminal import Host, Group, PFRule, Identity, SshConfig
+
+
+CollectResult = namedtuple('CollectResult', ('models', 'size'))
+
+
+def get_record_size(record):
+    """Return size of raw record serialized to json."""
+    return len(json.dumps(record, separators=(',', ':')))
+
+
+class GarbageCollector(object):
+    """Remove ssh configs and identities which nothing refers to.
+
+    Hosts, groups, port forwarding rules and visible identities are roots,
+    records referred by them through relation fields are marked reachable
+    transitively, not marked records of collected sets are swept. Records
+    are walked without model construction.
+    """
+
+    root_classes = (Host, Group, PFRule, Identity)
+    collected_classes = (SshConfig, Identity)
+
+    def __init__(self, storage):
+        """Construct collector for storage."""
+        self.storage = storage
+
+    # pylint: disable=no-self-use
+    def is_root(self, model_class, record):
+        """Check that record is kept regardless of references."""
+        if model_class is Identity:
+            return bool(record.get('is_visible'))
+        return True
+
+    def mark(self):
+        """Return set name and id pairs of reachable records."""
+        marked = set()
+        stack = []
+        for model_class in self.root_classes:
+            for record in self.storage.select_records(model_class):
+                if self.is_root(model_class, record):
+                    marked.add((model_class.set_name, record.get('id')))
+                    stack.append((model_class, record))
+
+        while stack:
+            model_class, record = stack.pop()
+            stack.extend(self.mark_references(model_class, record, marked))
+        return marked
+
+    def mark_references(self, model_class, record, marked):
+        """Mark records referred by record and return not walked ones."""
+        referred = []
+        for field_name, field in model_class.get_schema().fk_fields:
+            identificator = record.get(field_name)
+            key = (field.model.set_name, identificator)
+            if identificator is None or key in marked:
+                continue
+            marked.add(key)
+            referred.extend(
+                (field.model, i) for i in self.storage.indexes.lookup(
+                    field.model.set_name, 'id', identificator
+                )
+            )
+        return referred
+
+    def collect(self):
+        """Return not reachable models and size of their records."""
+        marked = self.mark()
+        constructor = self.storage.internal_model_constructor
+        models = []
+        size = 0
+        for model_class in self.collected_classes:
+            for record in self.storage.select_records(model_class):
+                if (model_class.set_name, record.get('id')) in marked:
+                    continue
+                models.append(constructor(record, model_class))
+                size += get_record_size(record)
+        return CollectResult(models, size)
+
+    def sweep(self):
+        """Delete not reachable models from storage."""
+        result = self.collect()
+        if result.models:
+            self.storage.delete_many(result.models)
+        return result
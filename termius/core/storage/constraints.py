@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""Module with unique and relation constraints of storage models."""
+import logging
+from collections import OrderedDict
+
+from ..exceptions import (
+    DoesNotExistException, RestrictedDeleteException, TooManyEntriesException,
+    UniqueConstraintException
+)
+from ..models.base import (
+    Model, get_referrer_fields, CASCADE, RESTRICT, SET_NULL
+)
+
+
+def get_relation_key(model):
+    """Return id of related model or identity key of unsaved one.
+
+    Unsaved model has no stored referrers, so unique keys with it match
+    only keys of other models referring to the same instance.
+    """
+    return getattr(model, model.id_name) or ('unsaved', id(model))
+
+
+def get_unique_key(fields, values):
+    """Return tuple of unique together field values, models become keys."""
+    key = [values.get(i) for i, _ in fields]
+    return tuple(
+        get_relation_key(i) if isinstance(i, Model) else i for i in key
+    )
+
+
+class Constraints(object):
+    """Check unique together fields and relations of storage models.
+
+    Constraints only read storage indexes, storage itself writes models
+    found by them.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self, storage):
+        """Construct constraints of storage."""
+        self.storage = storage
+
+    def get_by_unique(self, model_class, **kwargs):
+        """Retrieve single entry by values of unique together fields.
+
+        Usage:
+            tag = storage.constraints.get_by_unique(Tag, label='label')
+        """
+        for fields in model_class.get_schema().unique_together:
+            if set(kwargs) == set(i for i, _ in fields):
+                break
+        else:
+            raise ValueError('{} are not unique together fields.'.format(
+                ', '.join(sorted(kwargs))
+            ))
+        founded_models = self.storage.indexes.lookup_content(
+            model_class.set_name, fields, get_unique_key(fields, kwargs)
+        )
+        if not founded_models:
+            raise DoesNotExistException
+        if len(founded_models) != 1:
+            raise TooManyEntriesException
+        return self.storage.model_constructor(founded_models[0], model_class)
+
+    def count_referrers(self, model):
+        """Return count of records referring to model."""
+        return sum(
+            len(self.storage.indexes.lookup(
+                referrer_class.set_name, field_name, model.id
+            ))
+            for referrer_class, field_name, _ in get_referrer_fields(
+                type(model)
+            )
+        )
+
+    def referrers(self, model):
+        """Return models referring to model through relation fields."""
+        return [
+            self.storage.model_constructor(record, referrer_class)
+            for referrer_class, field_name, _ in get_referrer_fields(
+                type(model)
+            )
+            for record in list(self.storage.indexes.lookup(
+                referrer_class.set_name, field_name, model.id
+            ))
+        ]
+
+    def validate_unique(self, models):
+        """Raise error when models break unique together constraints."""
+        for model, fields in self.find_duplicates(models):
+            raise UniqueConstraintException(
+                '{} with same {} exists.'.format(
+                    model.set_name, ', '.join(i for i, _ in fields)
+                )
+            )
+
+    def skip_duplicates(self, models):
+        """Return models without ones breaking unique constraints."""
+        duplicates = self.find_duplicates(models)
+        for model, fields in duplicates:
+            self.logger.warning(
+                'Skip %s with same %s.',
+                model.set_name, ', '.join(i for i, _ in fields)
+            )
+        skipped = set(id(i) for i, _ in duplicates)
+        return [i for i in models if id(i) not in skipped]
+
+    def find_duplicates(self, models):
+        """Return models breaking unique together constraints with fields.
+
+        Constraints with empty field values and ones not changed since
+        model was stored are not checked, remote data saved by strategy
+        without unique checks is stored as is.
+        """
+        if not self.storage.strategies.saver.is_unique_checked:
+            return []
+        keys = set()
+        duplicates = []
+        for model in models:
+            model_keys = self._changed_unique_keys(model)
+            duplicated_keys = [
+                i for i in model_keys if self._is_duplicate(model, i, keys)
+            ]
+            if duplicated_keys:
+                duplicates.append((model, duplicated_keys[0][1]))
+            else:
+                keys.update(model_keys)
+        return duplicates
+
+    def _changed_unique_keys(self, model):
+        records = model.id and self.storage.indexes.lookup(
+            model.set_name, 'id', model.id
+        )
+        unique_keys = []
+        for fields in model.get_schema().unique_together:
+            key = get_unique_key(fields, model)
+            is_changed = not records or (
+                get_unique_key(fields, records[0]) != key
+            )
+            if all(key) and is_changed:
+                unique_keys.append((model.set_name, fields, key))
+        return unique_keys
+
+    def _is_duplicate(self, model, unique_key, keys):
+        set_name, fields, key = unique_key
+        return unique_key in keys or any(
+            i.get('id') != model.id
+            for i in self.storage.indexes.lookup_content(set_name, fields, key)
+        )
+
+    def resolve_delete(self, models):
+        """Return referrers to update and to delete with deleted models.
+
+        Relation fields with set null policy are cleared in returned
+        referrers, restrict policy raises error.
+        """
+        deleted = {(i.set_name, i.id) for i in models}
+        cascaded = []
+        nullified = OrderedDict()
+        stack = list(models)
+        while stack:
+            model = stack.pop()
+            for field_name, field, referrer in self._policy_referrers(
+                    model, deleted):
+                if field.on_delete == RESTRICT:
+                    self._restrict(model, referrer)
+                elif field.on_delete == CASCADE:
+                    self._cascade(referrer, deleted, cascaded)
+                    stack.append(referrer)
+                elif field.on_delete == SET_NULL:
+                    nullified.setdefault(
+                        (referrer.set_name, referrer.id), (referrer, [])
+                    )[1].append(field_name)
+        return self._set_null(nullified, deleted), cascaded
+
+    def _policy_referrers(self, model, deleted):
+        if model.id is None:
+            return
+        for referrer_class, field_name, field in get_referrer_fields(
+                type(model)):
+            if not field.on_delete:
+                continue
+            records = list(self.storage.indexes.lookup(
+                referrer_class.set_name, field_name, model.id
+            ))
+            for record in records:
+                if (referrer_class.set_name, record['id']) not in deleted:
+                    constructor = self.storage.internal_model_constructor
+                    yield field_name, field, constructor(
+                        record, referrer_class
+                    )
+
+    # pylint: disable=no-self-use
+    def _restrict(self, model, referrer):
+        raise RestrictedDeleteException('{} is referred by {}.'.format(
+            model.set_name, referrer.set_name
+        ))
+
+    # pylint: disable=no-self-use
+    def _cascade(self, referrer, deleted, cascaded):
+        deleted.add((referrer.set_name, referrer.id))
+        cascaded.append(referrer)
+
+    # pylint: disable=no-self-use
+    def _set_null(self, nullified, deleted):
+        updated = []
+        for key, (referrer, field_names) in nullified.items():
+            if key in deleted:
+                continue
+            for i in field_names:
+                setattr(referrer, i, None)
+            updated.append(referrer)
+        return updated
@@ -5,6 +5,8 @@ Driver means "dict converter to stream".
 """
 import abc
 import os
+import mmap
+import logging
 from collections import OrderedDict
 from contextlib import contextmanager
 from functools import partial
@@ -15,6 +17,8 @@ import csv
 import shutil
 import six
 
+from .indexes import IndexRegistry
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Driver(object):
@@ -60,6 +64,23 @@ class CSVDriver(Driver):
     loader = partial(csv.reader)
 
 
+def load_json_lines(stream):
+    """Load JSON document per line, skip unfinished last line."""
+    return [json.loads(i) for i in stream if i.endswith('\n')]
+
+
+class JournalDriver(Driver):
+    """JSON lines driver for journal entry list."""
+
+    def dump(self, stream, obj_data):
+        """Dump every entry of obj_data to stream as single line."""
+        for i in obj_data:
+            stream.write(json.dumps(i, separators=(',', ':')))
+            stream.write('\n')
+
+    loader = partial(load_json_lines)
+
+
 DRIVERS = OrderedDict((
     ('pickle', PickleDriver()),
     ('json', JSONDriver()),
@@ -93,8 +114,13 @@ class PersistentDict(OrderedDict):
     Input file format is automatically discovered.
     Output file format is selectable between pickle, json, and csv.
     All three serialization formats are backed by fast C implementations.
+
+    Changed keys are tracked, so sync skips writing when nothing changed.
     """
 
+    index_registry_class = IndexRegistry
+    logger = logging.getLogger(__name__)
+
     def __init__(self, filename, flag='c', mode=None, _format='json',
                  *args, **kwds):
         """Construct new dict.
@@ -110,22 +136,111 @@ class PersistentDict(OrderedDict):
         self.filename = filename
         self.write_mode = 'wb' if self._format == 'pickle' else 'w'
         self.read_mode = 'rb' if self._format == 'pickle' else 'r'
+        self.dirty_keys = set()
         super(PersistentDict, self).__init__(*args, **kwds)
         if flag != 'n' and os.access(filename, os.R_OK):
             with open(filename, self.read_mode) as fileobj:
                 self.load(fileobj)
+        self.dirty_keys.clear()
+
+    def __setitem__(self, key, value):
+        """Set key value and mark key changed."""
+        super(PersistentDict, self).__setitem__(key, value)
+        self.dirty_keys.add(key)
+
+    def __delitem__(self, key):
+        """Delete key and mark it changed."""
+        super(PersistentDict, self).__delitem__(key)
+        self.dirty_keys.add(key)
+
+    def clear(self):
+        """Delete all keys and mark them changed."""
+        self.dirty_keys.update(self.stored_keys())
+        super(PersistentDict, self).clear()
 
     def sync(self):
-        """Write dict to disk."""
-        if self.flag == 'r':
+        """Write dict to disk when it was changed."""
+        if self.flag == 'r' or not self.dirty_keys:
             return
+        self.flushed(self.write())
+
+    def write(self):
+        """Write whole dict to disk, return written bytes count."""
         with atomic_file(self.filename, self.write_mode, self.mode) as _file:
             self.dump(_file)
+            size = _file.tell()
+        return size
+
+    def flushed(self, size):
+        """Log written bytes count and forget changed keys."""
+        self.logger.debug(
+            'Storage wrote %s bytes, flushed sets: %s.',
+            size, ', '.join(sorted(self.dirty_keys))
+        )
+        self.dirty_keys.clear()
 
     def close(self):
         """Close storage."""
         self.sync()
 
+    def compact(self):
+        """Write all changes to main storage file."""
+        self.sync()
+
+    def append_record(self, key, record):
+        """Append record to key list."""
+        self.append_records(key, [record])
+
+    def append_records(self, key, records):
+        """Append records to key list."""
+        self.setdefault(key, []).extend(records)
+        for i in records:
+            self.mark_saved(key, i)
+
+    def remove_record(self, key, record):
+        """Remove record from key list."""
+        self.remove_records(key, [record])
+
+    def remove_records(self, key, records):
+        """Remove records from key list in one pass."""
+        stored = self.get(key)
+        if stored:
+            removed = set(id(i) for i in records)
+            stored[:] = [i for i in stored if id(i) not in removed]
+        for i in records:
+            self.mark_deleted(key, i)
+
+    def replace_records(self, key, pairs):
+        """Replace old records of key list with new ones in place."""
+        stored = self.get(key)
+        if stored:
+            replaced = dict((id(old), new) for old, new in pairs)
+            for index, i in enumerate(stored):
+                new = replaced.get(id(i))
+                if new is not None:
+                    stored[index] = new
+        for _, new in pairs:
+            self.mark_saved(key, new)
+
+    # pylint: disable=unused-argument
+    def select_records(self, key, query):
+        """Return key records which could match query."""
+        return self.setdefault(key, [])
+
+    def stored_keys(self):
+        """Return list of all keys."""
+        return list(self.keys())
+
+    # pylint: disable=unused-argument
+    def mark_saved(self, key, record):
+        """Handle record appended to key list."""
+        self.dirty_keys.add(key)
+
+    # pylint: disable=unused-argument
+    def mark_deleted(self, key, record):
+        """Handle record removed from key list."""
+        self.dirty_keys.add(key)
+
     def __enter__(self):
         """Process entering transaction."""
         return self
@@ -150,3 +265,304 @@ class PersistentDict(OrderedDict):
             except Exception:  # pylint: disable=broad-except
                 continue
         raise ValueError('File not in a supported format')
+
+
+class LazyPersistentDict(PersistentDict):
+    """Persistent dictionary which reads key value on first access.
+
+    Subclasses read value of not loaded key in `__missing__`.
+    """
+
+    def __missing__(self, key):
+        """Read key value, raise KeyError when it is not stored."""
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        """Check key in memory or in storage."""
+        return self.get(key) is not None
+
+    def get(self, key, default=None):
+        """Get key value from memory or storage."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        """Get key value or set default one."""
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def is_loaded(self, key):
+        """Check that key value is read to memory."""
+        return OrderedDict.__contains__(self, key)
+
+
+class SectionedPersistentDict(LazyPersistentDict):
+    """Persistent dictionary kept in file with section per key.
+
+    File header maps every key to byte range of its JSON value. Values
+    are read through mmap and decoded on first access, sync encodes only
+    changed values and copies bytes of other sections as is.
+    """
+
+    sections_suffix = '.sections'
+    signature = b'TERMIUS-SECTIONS 1\n'
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, filename, flag='c', mode=None):
+        """Construct new dict, read header of sections file."""
+        OrderedDict.__init__(self)
+        self.flag = flag
+        self.mode = mode
+        self.filename = filename + self.sections_suffix
+        self.dirty_keys = set()
+        self.sections = OrderedDict()
+        self.body_offset = 0
+        self.mapping = None
+        if flag != 'n' and os.access(self.filename, os.R_OK):
+            self.open_mapping()
+
+    def __missing__(self, key):
+        """Decode key section on first access."""
+        if key not in self.sections:
+            raise KeyError(key)
+        value = json.loads(self.read_section(key).decode('utf-8'))
+        OrderedDict.__setitem__(self, key, value)
+        return value
+
+    def open_mapping(self):
+        """Read sections header and map file to memory."""
+        with open(self.filename, 'rb') as fileobj:
+            if fileobj.readline() != self.signature:
+                raise ValueError('File not in a supported format')
+            header = json.loads(fileobj.readline().decode('utf-8'))
+            self.body_offset = fileobj.tell()
+            self.sections = OrderedDict(
+                (key, (offset, length)) for key, offset, length in header
+            )
+            if self.sections:
+                self.mapping = mmap.mmap(
+                    fileobj.fileno(), 0, access=mmap.ACCESS_READ
+                )
+
+    def close_mapping(self):
+        """Unmap file from memory."""
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+
+    def read_section(self, key):
+        """Return bytes of key section."""
+        offset, length = self.sections[key]
+        start = self.body_offset + offset
+        return self.mapping[start:start + length]
+
+    def encode_section(self, key):
+        """Return bytes of key value, encode it only when it is changed."""
+        if key not in self.dirty_keys:
+            return self.read_section(key)
+        value = OrderedDict.__getitem__(self, key)
+        return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+    def clear(self):
+        """Remove all keys from memory and storage."""
+        super(SectionedPersistentDict, self).clear()
+        self.sections = OrderedDict()
+
+    def stored_keys(self):
+        """Return list of keys from memory and storage."""
+        keys = list(self.sections)
+        keys.extend(i for i in self.keys() if i not in self.sections)
+        return keys
+
+    def write(self):
+        """Write sections file with header, return written bytes count."""
+        keys = self.stored_keys()
+        chunks = [self.encode_section(i) for i in keys]
+        header = []
+        offset = 0
+        for key, chunk in zip(keys, chunks):
+            header.append([key, offset, len(chunk)])
+            offset += len(chunk)
+        with atomic_file(self.filename, 'wb', self.mode) as fileobj:
+            fileobj.write(self.signature)
+            fileobj.write(json.dumps(header).encode('utf-8') + b'\n')
+            for i in chunks:
+                fileobj.write(i)
+            size = fileobj.tell()
+            self.close_mapping()
+        self.open_mapping()
+        return size
+
+
+class JournalPersistentDict(PersistentDict):
+    """Persistent dictionary which appends changes to journal file.
+
+    Saved and deleted records, replaced and deleted keys and clearing are
+    appended to `<filename>.journal` on sync and replayed on load, so
+    write cost is proportional to the changes. When journal size outgrows
+    `compaction_ratio` of snapshot size, the whole dict is written to
+    snapshot and journal is truncated.
+    """
+
+    journal_suffix = '.journal'
+    journal_driver = JournalDriver()
+    compaction_ratio = 0.5
+
+    def __init__(self, filename, *args, **kwargs):
+        """Construct new dict, replay journal after snapshot loading."""
+        self.journal_filename = filename + self.journal_suffix
+        self.changes = OrderedDict()
+        self.is_journal_torn = False
+        super(JournalPersistentDict, self).__init__(filename, *args, **kwargs)
+        if self.flag != 'n' and os.access(self.journal_filename, os.R_OK):
+            with open(self.journal_filename, 'r') as fileobj:
+                self.replay(self.journal_driver.load(fileobj))
+            self.is_journal_torn = _is_torn(self.journal_filename)
+        self.changes.clear()
+
+    def __setitem__(self, key, value):
+        """Set key value and supersede previous changes of key."""
+        super(JournalPersistentDict, self).__setitem__(key, value)
+        self._supersede_changes(key, 'set')
+
+    def __delitem__(self, key):
+        """Delete key and supersede previous changes of key."""
+        super(JournalPersistentDict, self).__delitem__(key)
+        self._supersede_changes(key, 'unset')
+
+    def clear(self):
+        """Delete all keys, previous changes are superseded."""
+        super(JournalPersistentDict, self).clear()
+        self.changes.clear()
+        self.changes[(None, None)] = 'clear'
+
+    def _supersede_changes(self, key, operation):
+        for change_key in [i for i in self.changes if i[0] == key]:
+            del self.changes[change_key]
+        self.changes[(key, None)] = operation
+
+    def mark_saved(self, key, record):
+        """Remember saved record to append it to journal."""
+        super(JournalPersistentDict, self).mark_saved(key, record)
+        self._add_change(key, record, 'put')
+
+    def mark_deleted(self, key, record):
+        """Remember deleted record to append it to journal."""
+        super(JournalPersistentDict, self).mark_deleted(key, record)
+        self._add_change(key, record, 'del')
+
+    def _add_change(self, key, record, operation):
+        change_key = (key, record.get('id'))
+        self.changes.pop(change_key, None)
+        self.changes[change_key] = (operation, record)
+
+    def sync(self):
+        """Append changes to journal and compact it when it is too big."""
+        if self.flag == 'r':
+            return
+        if not self.dirty_keys and not self.is_journal_torn:
+            return
+        journal_size = _file_size(self.journal_filename)
+        if self.changes and not self.is_journal_torn:
+            with open(self.journal_filename, 'a') as fileobj:
+                self.journal_driver.dump(fileobj, self.journal_entries())
+                fileobj.flush()
+                os.fsync(fileobj.fileno())
+        size = _file_size(self.journal_filename) - journal_size
+        if self.is_compaction_required():
+            size = self.compact()
+        self.changes.clear()
+        self.flushed(size)
+
+    def journal_entries(self):
+        """Generate journal entries for changes."""
+        for (key, identificator), change in self.changes.items():
+            if change == 'set':
+                yield {'op': 'set', 'key': key, 'value': self[key]}
+            elif change in ('unset', 'clear'):
+                yield {'op': change, 'key': key}
+            else:
+                operation, record = change
+                entry = {'op': operation, 'key': key, 'id': identificator}
+                if operation == 'put':
+                    entry['record'] = record
+                yield entry
+
+    def is_compaction_required(self):
+        """Check journal size ratio to snapshot size."""
+        if self.is_journal_torn:
+            return True
+        journal_size = _file_size(self.journal_filename)
+        if not journal_size:
+            return False
+        return journal_size > self.compaction_ratio * _file_size(
+            self.filename
+        )
+
+    def compact(self):
+        """Write whole dict to snapshot and truncate journal."""
+        size = self.write()
+        with open(self.journal_filename, 'w'):
+            self.is_journal_torn = False
+        return size
+
+    def replay(self, entries):
+        """Apply journal entries to dict."""
+        replayed = OrderedDict()
+        for entry in entries:
+            replay_entry = getattr(
+                self, 'replay_' + entry['op'], self.replay_record
+            )
+            replay_entry(entry, replayed)
+        for key, records in replayed.items():
+            OrderedDict.__setitem__(self, key, list(records.values()))
+
+    def replay_set(self, entry, replayed):
+        """Apply journal entry which replaces key value."""
+        replayed.pop(entry['key'], None)
+        OrderedDict.__setitem__(self, entry['key'], entry['value'])
+
+    def replay_unset(self, entry, replayed):
+        """Apply journal entry which deletes key."""
+        replayed.pop(entry['key'], None)
+        OrderedDict.pop(self, entry['key'], None)
+
+    # pylint: disable=unused-argument
+    def replay_clear(self, entry, replayed):
+        """Apply journal entry which deletes all keys."""
+        replayed.clear()
+        OrderedDict.clear(self)
+
+    def replay_record(self, entry, replayed):
+        """Apply journal entry which puts or deletes single record."""
+        key = entry['key']
+        records = replayed.get(key)
+        if records is None:
+            records = replayed[key] = OrderedDict(
+                (i.get('id'), i) for i in self.get(key, ())
+            )
+        if entry['op'] == 'put':
+            records[entry['id']] = entry['record']
+        else:
+            records.pop(entry['id'], None)
+
+
+def _file_size(filename):
+    try:
+        return os.path.getsize(filename)
+    except OSError:
+        return 0
+
+
+def _is_torn(filename):
+    """Check that last line of file is unfinished."""
+    if not _file_size(filename):
+        return False
+    with open(filename, 'rb') as fileobj:
+        fileobj.seek(-1, os.SEEK_END)
+        return fileobj.read(1) != b'\n'
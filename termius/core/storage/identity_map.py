@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Module with identity map for models materialized by storage."""
+import logging
+
+
+class IdentityMap(object):
+    """Keep materialized models to share them by reference.
+
+    Every model is stored per (set_name, id) key, so the same relation is
+    constructed only once while storage data stay unchanged. Views are
+    values computed from materialized models, they are forgotten with
+    models.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(self):
+        """Construct new empty identity map."""
+        self.models = {}
+        self.views = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_class, identificator):
+        """Return materialized model or None when it was not added."""
+        model = self.models.get((model_class.set_name, identificator))
+        if model is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return model
+
+    def add(self, model_class, identificator, model):
+        """Keep materialized model."""
+        self.models[(model_class.set_name, identificator)] = model
+
+    def get_view(self, name, identificator):
+        """Return computed view or None when it was not added."""
+        return self.views.get((name, identificator))
+
+    def add_view(self, name, identificator, value):
+        """Keep computed view."""
+        self.views[(name, identificator)] = value
+
+    def report_stats(self):
+        """Log hits and misses of materialized models."""
+        self.logger.debug(
+            'Identity map hits: %s, misses: %s.', self.hits, self.misses
+        )
+
+    def clear(self):
+        """Forget all materialized models and views."""
+        self.models.clear()
+        self.views.clear()
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Package to keep storage id generating logic."""
+import random
 from uuid import uuid4
 
 
@@ -23,3 +24,73 @@ class UUIDGenerator(object):
         identificator = uuid4().time_low
         setattr(model, model.id_name, identificator)
         return identificator
+
+    def generate_many(self, models):
+        """Generate ids for model list."""
+        return [self(i) for i in models]
+
+
+class SequenceGenerator(UUIDGenerator):
+    """ID generator based on sequence persisted in storage.
+
+    Ids are reserved in blocks, so storage is changed once per block, and
+    batches reserve single block for all models. Ids used by set already
+    (like random ids generated by previous versions) are skipped. Sequence
+    starts at random id far from small numbers, so different installs do
+    not hand out the same ids and ids are not mixed up with numeric labels.
+    """
+
+    key = 'id_sequence'
+    first_id_range = (2 ** 20, 2 ** 31)
+    block_size = 100
+
+    def __init__(self, storage):
+        """Construct generator with empty block."""
+        super(SequenceGenerator, self).__init__(storage)
+        self.next_id = self.block_end = 0
+
+    def __call__(self, model):
+        """Generate id.
+
+        :param core.models.Model model: generate and set id for this Model.
+        """
+        assert not getattr(model, model.id_name)
+        identificator = self.allocate(model.set_name)
+        setattr(model, model.id_name, identificator)
+        return identificator
+
+    def generate_many(self, models):
+        """Generate ids for model list from single block."""
+        self.reserve(len(models))
+        return [self(i) for i in models]
+
+    def allocate(self, set_name):
+        """Return next id not used in set."""
+        while True:
+            if self.next_id >= self.block_end:
+                self.reserve(1)
+            identificator = self.next_id
+            self.next_id += 1
+            if not self.is_used(set_name, identificator):
+                return identificator
+
+    def is_used(self, set_name, identificator):
+        """Check that set has record with id."""
+        return bool(self.storage.indexes.lookup(set_name, 'id', identificator))
+
+    def reserve(self, count):
+        """Reserve block with at least count ids unless current one has."""
+        if self.block_end - self.next_id >= count:
+            return
+        try:
+            start = self.storage.low_get(self.key)
+        except KeyError:
+            start = self.make_first_id()
+        start = max(start, self.block_end)
+        self.block_end = start + max(count, self.block_size)
+        self.next_id = start
+        self.storage.low_set(self.key, self.block_end)
+
+    def make_first_id(self):
+        """Return random start of new sequence."""
+        return random.randint(*self.first_id_range)
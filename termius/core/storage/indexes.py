@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+"""Module with in-memory indexes over raw storage records."""
+from bisect import bisect_left, bisect_right
+from itertools import count
+
+from .operators import parse_ip_address
+
+
+def raw_field_getter(field):
+    """Create getter for dotted field path of raw storage record."""
+    path = field.split('.')
+
+    def getter(record):
+        """Return field value or None when any part of path is empty."""
+        value = record
+        for i in path:
+            if not value:
+                return None
+            value = value.get(i)
+        return value
+    return getter
+
+
+def content_getter(fields):
+    """Create getter of field values tuple for field and default pairs."""
+    def getter(record):
+        """Return tuple of field values of record."""
+        return tuple(record.get(name, default) for name, default in fields)
+    return getter
+
+
+class HashIndex(object):
+    """Map field value to raw records of single set."""
+
+    def __init__(self, field):
+        """Construct new empty index for field."""
+        self.field = field
+        self.key_getter = raw_field_getter(field)
+        self.entries = {}
+
+    def build(self, records):
+        """Fill index with records."""
+        for i in records:
+            self.add(i)
+        return self
+
+    def add(self, record):
+        """Add record to index."""
+        key = self.key_getter(record)
+        if key is None:
+            return
+        self.entries.setdefault(key, []).append(record)
+
+    def remove(self, record):
+        """Remove record from index."""
+        key = self.key_getter(record)
+        bucket = self.entries.get(key)
+        if not bucket:
+            return
+        for index, i in enumerate(bucket):
+            if i is record:
+                bucket.pop(index)
+                break
+        if not bucket:
+            del self.entries[key]
+
+    def replace(self, old, new, position):
+        """Replace record in index, keep bucket in storage order."""
+        key = self.key_getter(old)
+        new_key = self.key_getter(new)
+        if key is not None and key == new_key:
+            bucket = self.entries.get(key, ())
+            for index, i in enumerate(bucket):
+                if i is old:
+                    bucket[index] = new
+                    return
+        self.remove(old)
+        self.add(new)
+        if new_key is not None:
+            self.entries[new_key].sort(key=position)
+
+    def lookup(self, key):
+        """Return records list with field value equals to key."""
+        return self.entries.get(key, ())
+
+
+class ContentIndex(HashIndex):
+    """Map values of several fields to raw records of single set.
+
+    Index is constructed for pairs of field and its default value, missing
+    fields of records are looked up with default.
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, fields):
+        """Construct new empty index for field and default pairs."""
+        self.field = fields
+        self.key_getter = content_getter(fields)
+        self.entries = {}
+
+
+class IntervalIndex(object):
+    """Keep raw records of single set sorted by IP address of field.
+
+    Records with values which are not IP addresses are not indexed.
+    """
+
+    def __init__(self, field):
+        """Construct new empty index for field."""
+        self.field = field
+        self.key_getter = raw_field_getter(field)
+        self.keys = []
+        self.records = []
+
+    def build(self, records):
+        """Fill index with records."""
+        entries = [(self.get_key(i), i) for i in records]
+        entries = sorted(
+            (i for i in entries if i[0] is not None), key=lambda i: i[0]
+        )
+        self.keys = [i[0] for i in entries]
+        self.records = [i[1] for i in entries]
+        return self
+
+    def get_key(self, record):
+        """Return comparable address of record or None."""
+        address = parse_ip_address(self.key_getter(record))
+        if address is None:
+            return None
+        return address.version, int(address)
+
+    def add(self, record):
+        """Add record to index."""
+        key = self.get_key(record)
+        if key is None:
+            return
+        position = bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.records.insert(position, record)
+
+    def remove(self, record):
+        """Remove record from index."""
+        key = self.get_key(record)
+        if key is None:
+            return
+        start = bisect_left(self.keys, key)
+        stop = bisect_right(self.keys, key)
+        for position in range(start, stop):
+            if self.records[position] is record:
+                del self.keys[position]
+                del self.records[position]
+                break
+
+    # pylint: disable=unused-argument
+    def replace(self, old, new, position):
+        """Replace record in index."""
+        self.remove(old)
+        self.add(new)
+
+    def lookup(self, network):
+        """Return records list with addresses in network."""
+        low = network.version, int(network.network_address)
+        high = network.version, int(network.broadcast_address)
+        start = bisect_left(self.keys, low)
+        stop = bisect_right(self.keys, high)
+        return self.records[start:stop]
+
+
+class RelationIndex(object):
+    """Map field value of single set records to set of related values.
+
+    Index is constructed for pair of fields (like tag and host of tag host
+    set), so related ids are combined with set operations without model
+    construction. Ids are sparse 32-bit integers, so sets are used instead
+    of bitmaps.
+    """
+
+    def __init__(self, fields):
+        """Construct new empty index for key and related fields pair."""
+        self.field, self.related_field = fields
+        self.key_getter = raw_field_getter(self.field)
+        self.related_getter = raw_field_getter(self.related_field)
+        self.entries = {}
+
+    def build(self, records):
+        """Fill index with records."""
+        for i in records:
+            self.add(i)
+        return self
+
+    def add(self, record):
+        """Add record to index."""
+        key = self.key_getter(record)
+        related = self.related_getter(record)
+        if key is None or related is None:
+            return
+        counts = self.entries.setdefault(key, {})
+        counts[related] = counts.get(related, 0) + 1
+
+    def remove(self, record):
+        """Remove record from index."""
+        key = self.key_getter(record)
+        related = self.related_getter(record)
+        counts = self.entries.get(key)
+        if not counts or related not in counts:
+            return
+        counts[related] -= 1
+        if not counts[related]:
+            del counts[related]
+        if not counts:
+            del self.entries[key]
+
+    # pylint: disable=unused-argument
+    def replace(self, old, new, position):
+        """Replace record in index."""
+        self.remove(old)
+        self.add(new)
+
+    def lookup_any(self, keys):
+        """Return related values of records with any of keys."""
+        result = set()
+        for i in keys:
+            result.update(self.entries.get(i, ()))
+        return result
+
+    def lookup_all(self, keys):
+        """Return related values of records with every key."""
+        buckets = sorted(
+            (self.entries.get(i, {}) for i in keys), key=len
+        )
+        if not buckets:
+            return set()
+        result = set(buckets[0])
+        for i in buckets[1:]:
+            result.intersection_update(i)
+        return result
+
+
+class ClosureIndex(object):
+    """Keep tree of single set records related to parent by field.
+
+    Ancestor paths are materialized on first request and dropped for whole
+    subtree when record is added or removed, descendants are collected
+    from children lists kept in storage order.
+    """
+
+    def __init__(self, field):
+        """Construct new empty index for parent field."""
+        self.field = field
+        self.key_getter = raw_field_getter(field)
+        self.parents = {}
+        self.children = {}
+        self.paths = {}
+
+    def build(self, records):
+        """Fill index with records."""
+        for i in records:
+            self.add(i)
+        return self
+
+    def add(self, record):
+        """Add record to tree."""
+        identificator = record.get('id')
+        if identificator is None:
+            return
+        parent = self.key_getter(record)
+        self.parents[identificator] = parent
+        self.children.setdefault(parent, []).append(identificator)
+        self.invalidate(identificator)
+
+    def remove(self, record):
+        """Remove record from tree, its children are kept."""
+        identificator = record.get('id')
+        if identificator not in self.parents:
+            return
+        parent = self.parents.pop(identificator)
+        siblings = self.children[parent]
+        siblings.remove(identificator)
+        if not siblings:
+            del self.children[parent]
+        self.invalidate(identificator)
+
+    # pylint: disable=unused-argument
+    def replace(self, old, new, position):
+        """Replace record in index."""
+        self.remove(old)
+        self.add(new)
+
+    def invalidate(self, identificator):
+        """Drop materialized paths of record and its descendants."""
+        self.paths.pop(identificator, None)
+        for i in self.descendants(identificator):
+            self.paths.pop(i, None)
+
+    def ancestors(self, identificator):
+        """Return ancestor id list of record, the nearest goes first."""
+        path = self.paths.get(identificator)
+        if path is None:
+            path = []
+            visited = {identificator}
+            parent = self.parents.get(identificator)
+            while parent is not None and parent not in visited:
+                visited.add(parent)
+                path.append(parent)
+                parent = self.parents.get(parent)
+            path = self.paths[identificator] = tuple(path)
+        return list(path)
+
+    def descendants(self, identificator):
+        """Return descendant id list of record in depth-first order."""
+        result = []
+        visited = {identificator}
+        stack = list(reversed(self.children.get(identificator, ())))
+        while stack:
+            child = stack.pop()
+            if child in visited:
+                continue
+            visited.add(child)
+            result.append(child)
+            stack.extend(reversed(self.children.get(child, ())))
+        return result
+
+
+class IndexRegistry(object):
+    """Keep indexes for every set of storage driver.
+
+    Indexes of set are built on first lookup and then they are kept up to
+    date by storage on every create, update and delete. Indexes for fields
+    out of default ones are built on first lookup of field. Registry keeps
+    position of every record to restore set order of merged lookups.
+    """
+
+    index_class = HashIndex
+    interval_index_class = IntervalIndex
+    closure_index_class = ClosureIndex
+    relation_index_class = RelationIndex
+    content_index_class = ContentIndex
+
+    def __init__(self, driver, fields):
+        """Construct registry for driver sets."""
+        self.driver = driver
+        self.fields = fields
+        self.indexes = {}
+        self.positions = {}
+        self.counter = count()
+
+    def lookup(self, set_name, field, key):
+        """Return set records with field value equals to key."""
+        return self.get_index(set_name, field).lookup(key)
+
+    def lookup_network(self, set_name, field, network):
+        """Return set records with field address in network."""
+        index = self.get_index(set_name, field, self.interval_index_class)
+        return index.lookup(network)
+
+    def get_closure(self, set_name, field):
+        """Return tree of set records related to parent by field."""
+        return self.get_index(set_name, field, self.closure_index_class)
+
+    def get_relation_index(self, set_name, field, related_field):
+        """Return index of related field values per set field value."""
+        return self.get_index(
+            set_name, (field, related_field), self.relation_index_class
+        )
+
+    def lookup_content(self, set_name, fields, key):
+        """Return set records with values of fields equal to key."""
+        index = self.get_index(set_name, fields, self.content_index_class)
+        return index.lookup(key)
+
+    def get_index(self, set_name, field, index_class=None):
+        """Return index of set field, build it if need."""
+        index_class = index_class or self.index_class
+        index_key = field
+        if index_class is not self.index_class:
+            index_key = field, index_class
+        set_indexes = self.get_set_indexes(set_name)
+        index = set_indexes.get(index_key)
+        if index is None:
+            records = self.driver.get(set_name) or ()
+            index = index_class(field).build(records)
+            set_indexes[index_key] = index
+        return index
+
+    # pylint: disable=unused-argument
+    def is_lookup_supported(self, set_name):
+        """Check that set could be queried with indexes."""
+        return True
+
+    def sort(self, set_name, records):
+        """Sort records of set in storage order."""
+        positions = self.positions[set_name]
+        return sorted(records, key=lambda i: positions[id(i)])
+
+    def get_set_indexes(self, set_name):
+        """Return indexes of set, build it if need."""
+        set_indexes = self.indexes.get(set_name)
+        if set_indexes is None:
+            set_indexes = self.build(set_name)
+        return set_indexes
+
+    def build(self, set_name):
+        """Build all indexes for set."""
+        records = self.driver.get(set_name) or ()
+        set_indexes = {
+            i: self.index_class(i).build(records) for i in self.fields
+        }
+        self.indexes[set_name] = set_indexes
+        self.positions[set_name] = {
+            id(i): next(self.counter) for i in records
+        }
+        return set_indexes
+
+    def add(self, set_name, record):
+        """Add record to set indexes if they are built."""
+        if set_name not in self.indexes:
+            return
+        for i in self.indexes[set_name].values():
+            i.add(record)
+        self.positions[set_name][id(record)] = next(self.counter)
+
+    def remove(self, set_name, record):
+        """Remove record from set indexes if they are built."""
+        if set_name not in self.indexes:
+            return
+        for i in self.indexes[set_name].values():
+            i.remove(record)
+        self.positions[set_name].pop(id(record), None)
+
+    def replace(self, set_name, old, new):
+        """Replace record in set indexes if they are built."""
+        if set_name not in self.indexes:
+            return
+        positions = self.positions[set_name]
+        old_position = positions.pop(id(old), None)
+        if old_position is None:
+            old_position = next(self.counter)
+        positions[id(new)] = old_position
+        for i in self.indexes[set_name].values():
+            i.replace(old, new, lambda record: positions[id(record)])
+
+    def invalidate(self, set_name):
+        """Drop set indexes, they will be rebuilt on next lookup."""
+        self.indexes.pop(set_name, None)
+        self.positions.pop(set_name, None)
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
 """Module to keep operators that using to filter model list."""
-from operator import eq, ne, gt, lt, le, ge, contains, attrgetter # noqa
+import re
+from fnmatch import translate
+from operator import eq, ne, gt, lt, le, ge, contains, attrgetter  # noqa
+
+from ipaddress import ip_address, ip_network
+import six
 
 
 def rcontains(obj, seq):
@@ -9,3 +14,45 @@ def rcontains(obj, seq):
     Motivation: use it like ge, le, gt, lt etc. (aka operator(value, const))
     """
     return contains(seq, obj)
+
+
+def glob(obj, pattern):
+    """Check that obj matches compiled shell-style pattern."""
+    return isinstance(obj, six.string_types) and bool(pattern.match(obj))
+
+
+def regex(obj, pattern):
+    """Check that compiled regular expression is found in obj."""
+    return isinstance(obj, six.string_types) and bool(pattern.search(obj))
+
+
+def cidr(obj, network):
+    """Check that obj is IP address in network."""
+    address = parse_ip_address(obj)
+    return address is not None and address in network
+
+
+def parse_ip_address(obj):
+    """Return IP address of obj or None when obj is not an address."""
+    try:
+        return ip_address(six.text_type(obj))
+    except ValueError:
+        return None
+
+
+def compile_glob(pattern):
+    """Compile shell-style pattern to regular expression."""
+    return re.compile(translate(pattern))
+
+
+def compile_network(network):
+    """Parse network in CIDR notation, host bits are ignored."""
+    return ip_network(six.text_type(network), strict=False)
+
+
+# Operator value compilers, they run once per query.
+COMPILERS = {
+    'glob': compile_glob,
+    'regex': re.compile,
+    'cidr': compile_network,
+}
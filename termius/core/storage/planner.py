@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Module with query planner over storage indexes."""
+from collections import namedtuple
+
+from .query import Query
+
+
+IndexLookup = namedtuple('IndexLookup', ('field', 'operator_name', 'keys'))
+SEQUENCE_TYPES = (list, tuple, set, frozenset)
+
+
+def is_index_key(value):
+    """Check that value could be looked up in hash index."""
+    if value is None:
+        return False
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class QueryPlan(object):
+    """Way to select records of set which could match query."""
+
+    def __init__(self, set_name, query, lookups=None):
+        """Construct plan, plan without lookups scans whole set."""
+        self.set_name = set_name
+        self.query = query
+        self.lookups = lookups
+
+    @property
+    def is_indexed(self):
+        """Check that plan uses indexes."""
+        return bool(self.lookups)
+
+    def explain(self):
+        """Return human readable plan description."""
+        if not self.is_indexed:
+            return 'scan {}'.format(self.set_name)
+        joiner = ' or ' if self.query.operators_union is any else ' and '
+        return 'index lookup {}'.format(joiner.join(
+            '{}.{} ({})'.format(self.set_name, i.field, i.operator_name)
+            for i in self.lookups
+        ))
+
+
+class QueryPlanner(object):
+    """Choose index lookups for query or fall back to scan.
+
+    Lookups with eq and rcontains operators on id, label, remote instance
+    id and relation ids are done with hash indexes. Query with all union
+    uses the most selective lookup, query with any union uses indexes only
+    when every operator could be looked up. Lookups with cidr operator on
+    address fields are done with interval indexes. Records selected by plan
+    are checked with query anyway.
+    """
+
+    interval_fields = ('address',)
+    keys_getters = {
+        'eq': 'get_eq_keys',
+        'rcontains': 'get_rcontains_keys',
+    }
+
+    def __init__(self, storage):
+        """Construct planner for storage."""
+        self.storage = storage
+
+    def plan(self, model_class, query):
+        """Create plan for query on model set."""
+        set_name = model_class.set_name
+        if query.operators_union not in (all, any):
+            return QueryPlan(set_name, query)
+        if not self.storage.indexes.is_lookup_supported(set_name):
+            return QueryPlan(set_name, query)
+
+        index_fields = self.get_index_fields(model_class)
+        interval_fields = self.get_interval_fields(model_class)
+        lookups = [
+            self.make_lookup(index_fields, i) or
+            self.make_interval_lookup(interval_fields, i)
+            for i in query.operators
+        ]
+        if query.operators_union is any:
+            if not all(lookups):
+                return QueryPlan(set_name, query)
+            return QueryPlan(set_name, query, lookups)
+
+        lookups = [i for i in lookups if i]
+        if not lookups:
+            return QueryPlan(set_name, query)
+        best_lookup = min(lookups, key=lambda i: self.count(set_name, i))
+        return QueryPlan(set_name, query, [best_lookup])
+
+    def explain(self, model_class, query_union=None, **kwargs):
+        """Describe how filter with passed lookups selects records."""
+        query = Query(query_union, **kwargs)
+        return self.plan(model_class, query).explain()
+
+    def execute(self, plan):
+        """Return records selected by plan."""
+        if not plan.is_indexed:
+            return self.storage.driver.select_records(
+                plan.set_name, plan.query
+            )
+        buckets = [
+            self.lookup(plan.set_name, i, key)
+            for i in plan.lookups for key in i.keys
+        ]
+        buckets = [i for i in buckets if i]
+        if not buckets:
+            return []
+        if len(buckets) == 1 and plan.lookups[0].operator_name != 'cidr':
+            return list(buckets[0])
+        records = {id(i): i for bucket in buckets for i in bucket}
+        return self.storage.indexes.sort(plan.set_name, records.values())
+
+    def count(self, set_name, lookup):
+        """Return count of records found by lookup."""
+        return sum(len(self.lookup(set_name, lookup, i)) for i in lookup.keys)
+
+    def lookup(self, set_name, lookup, key):
+        """Return records found by lookup with single key."""
+        indexes = self.storage.indexes
+        if lookup.operator_name == 'cidr':
+            return indexes.lookup_network(set_name, lookup.field, key)
+        return indexes.lookup(set_name, lookup.field, key)
+
+    # pylint: disable=no-self-use
+    def get_index_fields(self, model_class):
+        """Map query fields to raw record fields with indexes."""
+        index_fields = {
+            'id': 'id',
+            'label': 'label',
+            'remote_instance.id': 'remote_instance.id',
+        }
+        for i in model_class.fk_field_names():
+            index_fields[i] = i
+            index_fields[i + '.id'] = i
+        return index_fields
+
+    def get_interval_fields(self, model_class):
+        """Return address fields of model with interval indexes."""
+        fields = model_class.allowed_fields()
+        return [i for i in self.interval_fields if i in fields]
+
+    # pylint: disable=no-self-use
+    def make_interval_lookup(self, interval_fields, operator):
+        """Create interval index lookup for operator or return None."""
+        if operator.operator_name != 'cidr':
+            return None
+        if operator.field not in interval_fields:
+            return None
+        return IndexLookup(operator.field, 'cidr', (operator.value,))
+
+    # pylint: disable=no-self-use
+    def make_lookup(self, index_fields, operator):
+        """Create index lookup for operator or return None."""
+        field = index_fields.get(operator.field)
+        keys_getter = self.keys_getters.get(operator.operator_name)
+        if field is None or keys_getter is None:
+            return None
+        keys = getattr(self, keys_getter)(operator.value)
+        if keys is None or not all(is_index_key(i) for i in keys):
+            return None
+        return IndexLookup(field, operator.operator_name, keys)
+
+    # pylint: disable=no-self-use
+    def get_eq_keys(self, value):
+        """Return index keys for eq operator value."""
+        return (value,)
+
+    # pylint: disable=no-self-use
+    def get_rcontains_keys(self, value):
+        """Return index keys for rcontains operator value or None."""
+        if not isinstance(value, SEQUENCE_TYPES):
+            return None
+        return tuple(value)
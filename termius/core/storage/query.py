@@ -3,11 +3,69 @@
 from . import operators
 
 
+_FIELD_GETTERS = {}
+
+
+def get_field_getter(field):
+    """Return cached attrgetter for field path."""
+    getter = _FIELD_GETTERS.get(field)
+    if getter is None:
+        getter = _FIELD_GETTERS[field] = operators.attrgetter(field)
+    return getter
+
+
+def all_predicate(predicates):
+    """Create predicate checking that every predicate is true."""
+    def predicate(obj):
+        """Check that every predicate is true, stop on first false."""
+        for i in predicates:
+            if not i(obj):
+                return False
+        return True
+    return predicate
+
+
+def any_predicate(predicates):
+    """Create predicate checking that any predicate is true."""
+    def predicate(obj):
+        """Check that any predicate is true, stop on first true."""
+        for i in predicates:
+            if i(obj):
+                return True
+        return False
+    return predicate
+
+
+def union_predicate(predicates, union):
+    """Create predicate joining results of every predicate with union."""
+    def predicate(obj):
+        """Union results of every predicate."""
+        return union([i(obj) for i in predicates])
+    return predicate
+
+
+PREDICATE_COMPILERS = {all: all_predicate, any: any_predicate}
+
+
+def compile_predicate(predicates, union):
+    """Join predicates with union into single function."""
+    predicates = tuple(predicates)
+    compiler = PREDICATE_COMPILERS.get(union)
+    if compiler is None:
+        return union_predicate(predicates, union)
+    if len(predicates) == 1:
+        return predicates[0]
+    return compiler(predicates)
+
+
 # pylint: disable=too-few-public-methods
 class QueryOperator(object):
     """Operators for list's filtering."""
 
-    operators = ['eq', 'ne', 'gt', 'lt', 'le', 'ge', 'rcontains', 'contains']
+    operators = [
+        'eq', 'ne', 'gt', 'lt', 'le', 'ge', 'rcontains', 'contains',
+        'glob', 'regex', 'cidr',
+    ]
 
     def __init__(self, field, value):
         """Construct new operator."""
@@ -16,25 +74,34 @@ class QueryOperator(object):
 
         if operator_name not in self.operators:
             operator_name = 'eq'
-            self.get_field = operators.attrgetter(field)
         else:
-            self.get_field = operators.attrgetter('.'.join(splited_field[:-1]))
+            field = '.'.join(splited_field[:-1])
 
+        self.field = field
+        self.get_field = get_field_getter(field)
+        self.operator_name = operator_name
         self.operator = getattr(operators, operator_name)
-        self.value = value
+        compiler = operators.COMPILERS.get(operator_name)
+        self.value = compiler(value) if compiler else value
 
     def __call__(self, obj):
-        """Filter single object."""
+        """Filter single object.
+
+        Missing field values and values incomparable with operator value
+        (e.g. None ordered against number) do not match.
+        """
         try:
-            field = self.get_field(obj)
-        except AttributeError:
+            return self.operator(self.get_field(obj), self.value)
+        except (AttributeError, TypeError):
             return False
-        return self.operator(field, self.value)
 
 
 # pylint: disable=too-few-public-methods
 class Query(object):
-    """Query construction class (aka set of operators)."""
+    """Query construction class (aka set of operators).
+
+    Operators are compiled to single predicate on construction.
+    """
 
     def __init__(self, union=None, **kwargs):
         """Construct new query."""
@@ -42,9 +109,10 @@ class Query(object):
         self.operators = [
             QueryOperator(k, v) for k, v in kwargs.items()
         ]
+        self.predicate = compile_predicate(
+            self.operators, self.operators_union
+        )
 
     def __call__(self, obj):
         """Call all operators for object and union results."""
-        filters = [i(obj) for i in self.operators]
-        result = self.operators_union(filters)
-        return result
+        return self.predicate(obj)
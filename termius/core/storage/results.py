@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Module with lazy result sets of storage models."""
+from itertools import islice
+
+from .query import Query, get_field_getter
+from .indexes import raw_field_getter
+
+
+def ordering_key(field, getter_factory=get_field_getter):
+    """Return sort key function for field path and reverse flag.
+
+    Prefix field with minus to sort in descending order, empty values are
+    placed before others.
+    """
+    reverse = field.startswith('-')
+    getter = getter_factory(field.lstrip('-'))
+
+    def key(model):
+        """Return comparable value of model field."""
+        try:
+            value = getter(model)
+        except AttributeError:
+            value = None
+        return value is not None, value
+    return key, reverse
+
+
+class ResultSet(object):
+    """Lazy model list selected from storage.
+
+    Models are constructed only while result set is iterated. Ordering by
+    plain fields, offset, limit and count of result set without lookups
+    are done over raw records.
+    """
+
+    def __init__(self, storage, model_class):
+        """Construct result set with all models of class."""
+        self.storage = storage
+        self.model_class = model_class
+        self.conditions = ()
+        self.ordering = None
+        self.start = 0
+        self.stop = None
+
+    def filter(self, query_union=None, **kwargs):
+        """Return result set of models matched lookups."""
+        query = Query(query_union, **kwargs)
+        return self.clone(conditions=self.conditions + ((query, False),))
+
+    def exclude(self, query_union=None, **kwargs):
+        """Return result set of models not matched lookups."""
+        query = Query(query_union, **kwargs)
+        return self.clone(conditions=self.conditions + ((query, True),))
+
+    def order_by(self, field):
+        """Return result set ordered by model field."""
+        return self.clone(ordering=field)
+
+    def offset(self, count):
+        """Return result set without first count models."""
+        start = self.start + count
+        if self.stop is not None:
+            start = min(start, self.stop)
+        return self.clone(start=start)
+
+    def limit(self, count):
+        """Return result set with at most count models."""
+        stop = self.start + count
+        if self.stop is not None:
+            stop = min(stop, self.stop)
+        return self.clone(stop=stop)
+
+    def count(self):
+        """Return count of models in result set."""
+        if self.conditions:
+            total = sum(1 for _ in self.iterate_models(self.get_records()))
+        else:
+            total = len(self.get_records())
+        if self.stop is not None:
+            total = min(total, self.stop)
+        return max(total - self.start, 0)
+
+    def __iter__(self):
+        """Construct and yield models of result set."""
+        records = self.get_records()
+        model_ordering = None
+        if self.ordering:
+            if self.is_raw_field(self.ordering.lstrip('-')):
+                key, reverse = ordering_key(self.ordering, raw_field_getter)
+                records.sort(key=key, reverse=reverse)
+            else:
+                model_ordering = ordering_key(self.ordering)
+
+        if not self.conditions and not model_ordering:
+            return self.iterate_models(records[self.start:self.stop])
+        models = self.iterate_models(records)
+        if model_ordering:
+            key, reverse = model_ordering
+            models = sorted(models, key=key, reverse=reverse)
+        return islice(models, self.start, self.stop)
+
+    def clone(self, **kwargs):
+        """Copy result set with changed attributes."""
+        result_set = self.__class__(self.storage, self.model_class)
+        result_set.__dict__.update(self.__dict__)
+        result_set.__dict__.update(kwargs)
+        return result_set
+
+    def get_records(self):
+        """Return list of raw records which could match lookups."""
+        queries = [i for i, is_excluded in self.conditions if not is_excluded]
+        query = queries[0] if queries else None
+        return list(self.storage.select_records(self.model_class, query))
+
+    def iterate_models(self, records):
+        """Construct models for records, skip not matched ones."""
+        constructor = self.storage.model_constructor
+        for i in records:
+            model = constructor(i, self.model_class)
+            if self.is_matched(model):
+                yield model
+
+    def is_matched(self, model):
+        """Check model with every lookup of result set."""
+        for query, is_excluded in self.conditions:
+            if bool(query(model)) == is_excluded:
+                return False
+        return True
+
+    def is_raw_field(self, field):
+        """Check that field could be read from raw record as is."""
+        return (
+            '.' not in field and
+            field not in self.model_class.fk_field_names()
+        )
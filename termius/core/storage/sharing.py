@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Module to split records shared by content before push."""
+from ..models.base import get_referrer_fields
+from .query import Query
+from .strategies import RelatedSaveStrategy
+
+
+class SharedContentSplitter(object):
+    """Give every referrer own copy of ssh config or identity.
+
+    Records are shared by content in local storage only, cloud keeps own
+    record per referrer. So not synced record referred by several models
+    is copied for every referrer but first one. Referrers are saved with
+    own save strategy, so they are marked updated and pushed with new
+    relations even when storage saves synced models.
+
+    Synced records are never shared, so sharing by content keeps vault
+    small only until push, synced vault keeps record per referrer.
+    """
+
+    shared_classes = RelatedSaveStrategy.content_shared_classes
+
+    def __init__(self, storage):
+        """Construct splitter for storage."""
+        self.storage = storage
+        self.saver = RelatedSaveStrategy(storage)
+
+    def split(self):
+        """Copy shared records and return updated referrers.
+
+        Only not synced records are split, they are sent as created ones.
+        """
+        query = Query(remote_instance=None)
+        strategies = self.storage.strategies
+        self.storage.strategies = strategies._replace(saver=self.saver)
+        try:
+            return [
+                referrer
+                for model_class in self.shared_classes
+                for record in list(
+                    self.storage.select_records(model_class, query)
+                )
+                if self.saver.is_shareable(record)
+                for referrer in self.split_record(model_class, record)
+            ]
+        finally:
+            self.storage.strategies = strategies
+
+    def split_record(self, model_class, record):
+        """Copy record for every its referrer but first one."""
+        referrers = self.get_referrers(model_class, record['id'])
+        for referrer, field_name in referrers[1:]:
+            copied = model_class(record)
+            copied.id = None
+            referrer[field_name] = self.storage.save(copied).id
+            self.storage.save(referrer)
+        return [i for i, _ in referrers[1:]]
+
+    def get_referrers(self, model_class, identificator):
+        """Return referrers of record with names of relation fields."""
+        constructor = self.storage.internal_model_constructor
+        return [
+            (constructor(i, referrer_class), field_name)
+            for referrer_class, field_name, _ in get_referrer_fields(
+                model_class
+            )
+            for i in list(self.storage.indexes.lookup(
+                referrer_class.set_name, field_name, identificator
+            ))
+        ]
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""Module with SQLite driver for application storage."""
+import os
+import json
+import sqlite3
+from collections import OrderedDict
+
+import six
+
+from ..models.terminal import (
+    SshKey, Snippet,
+    Identity, SshConfig,
+    Tag, Group,
+    Host, PFRule,
+    TagHost
+)
+from .driver import LazyPersistentDict
+from .indexes import IndexRegistry, raw_field_getter
+from .planner import SEQUENCE_TYPES
+
+
+COMMON_FIELDS = ('id', 'label', 'remote_instance.id')
+SCHEMA = {
+    i.set_name: COMMON_FIELDS + i.fk_field_names()
+    for i in (
+        SshKey, Snippet,
+        Identity, SshConfig,
+        Tag, Group,
+        Host, PFRule,
+        TagHost
+    )
+}
+BINDABLE_TYPES = six.integer_types + six.string_types + (float,)
+MAX_PARAMETERS = 500
+
+
+class Table(object):
+    """SQLite table keeping records of single set."""
+
+    operator_compilers = {
+        'eq': 'compile_eq',
+        'rcontains': 'compile_rcontains',
+    }
+
+    def __init__(self, name):
+        """Construct table for set name."""
+        self.name = name
+        self.fields = SCHEMA.get(name, COMMON_FIELDS)
+        self.columns = tuple(i.replace('.', '_') for i in self.fields)
+        self.getters = tuple(raw_field_getter(i) for i in self.fields)
+        self.field_columns = dict(zip(self.fields, self.columns))
+        self.lookup_columns = dict(self.field_columns)
+        self.null_columns = {'remote_instance': 'remote_instance_id'}
+        for field, column in zip(self.fields, self.columns):
+            if field not in COMMON_FIELDS:
+                self.lookup_columns[field + '.id'] = column
+                self.null_columns[field] = column
+
+    def create_statements(self):
+        """Generate SQL to create table and its indexes."""
+        columns = ''.join(', "{}"'.format(i) for i in self.columns)
+        yield (
+            'CREATE TABLE IF NOT EXISTS "{}" ('
+            'seq INTEGER PRIMARY KEY AUTOINCREMENT{}, data TEXT NOT NULL, '
+            'UNIQUE ("id"))'
+        ).format(self.name, columns)
+        for i in self.columns[1:]:
+            yield (
+                'CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ("{1}")'
+            ).format(self.name, i)
+
+    def insert_statement(self):
+        """Return SQL to insert or replace record row."""
+        columns = ''.join('"{}", '.format(i) for i in self.columns)
+        placeholders = '?, ' * len(self.columns)
+        return 'INSERT OR REPLACE INTO "{}" ({}data) VALUES ({}?)'.format(
+            self.name, columns, placeholders
+        )
+
+    def update_statement(self):
+        """Return SQL to update record row by id keeping its position."""
+        columns = ''.join('"{}" = ?, '.format(i) for i in self.columns)
+        return 'UPDATE "{}" SET {}data = ? WHERE "id" = ?'.format(
+            self.name, columns
+        )
+
+    def row(self, record):
+        """Return row values for record."""
+        values = tuple(_bindable_or_none(i(record)) for i in self.getters)
+        return values + (json.dumps(record, separators=(',', ':')),)
+
+    def compile(self, query):
+        """Translate query to SQL condition, return None when impossible."""
+        if query.operators_union not in (all, any):
+            return None
+        conditions = []
+        params = []
+        for i in query.operators:
+            condition = self.compile_operator(i, params)
+            if condition is None:
+                if query.operators_union is any:
+                    return None
+                continue
+            conditions.append(condition)
+        if not conditions:
+            return None
+        joiner = ' AND ' if query.operators_union is all else ' OR '
+        return joiner.join(conditions), params
+
+    def compile_operator(self, operator, params):
+        """Translate query operator to SQL condition or return None."""
+        compiler_name = self.operator_compilers.get(operator.operator_name)
+        if compiler_name is None:
+            return None
+        return getattr(self, compiler_name)(operator, params)
+
+    def compile_eq(self, operator, params):
+        """Translate eq operator to SQL condition or return None."""
+        if operator.value is None:
+            column = self.null_columns.get(operator.field)
+            return column and '"{}" IS NULL'.format(column)
+        column = self.lookup_columns.get(operator.field)
+        if column is None or not isinstance(operator.value, BINDABLE_TYPES):
+            return None
+        params.append(operator.value)
+        return '"{}" = ?'.format(column)
+
+    def compile_rcontains(self, operator, params):
+        """Translate rcontains operator to SQL condition or return None.
+
+        Only value sequences are translated, string value is checked for
+        substring in Python.
+        """
+        column = self.lookup_columns.get(operator.field)
+        if column is None or not isinstance(operator.value, SEQUENCE_TYPES):
+            return None
+        values = list(operator.value)
+        is_bindable = all(isinstance(i, BINDABLE_TYPES) for i in values)
+        if not is_bindable or len(values) > MAX_PARAMETERS:
+            return None
+        params.extend(values)
+        return '"{}" IN ({})'.format(column, ', '.join('?' * len(values)))
+
+
+class SQLiteIndexRegistry(IndexRegistry):
+    """Registry which looks up not loaded sets in database."""
+
+    def lookup(self, set_name, field, key):
+        """Return records from database until set is loaded in memory."""
+        if not self.driver.is_loaded(set_name):
+            records = self.driver.lookup_records(set_name, field, key)
+            if records is not None:
+                return records
+        return super(SQLiteIndexRegistry, self).lookup(set_name, field, key)
+
+    def is_lookup_supported(self, set_name):
+        """Query only loaded sets with indexes, others are queried in SQL."""
+        return self.driver.is_loaded(set_name)
+
+
+class SQLitePersistentDict(LazyPersistentDict):
+    """Persistent dictionary kept in SQLite database.
+
+    Every set is kept in own table with indexed columns for id, label,
+    remote instance id and relation ids, other values are kept in meta
+    table. Sets are read on first access, every record change is written
+    as single row and sync commits transaction when anything changed.
+    """
+
+    database_suffix = '.sqlite3'
+    index_registry_class = SQLiteIndexRegistry
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, filename, flag='c', mode=None):
+        """Open database and read its table list."""
+        OrderedDict.__init__(self)
+        self.flag = flag
+        self.mode = mode
+        self.filename = filename + self.database_suffix
+        self.dirty_keys = set()
+        self.written_size = 0
+        self.connection = sqlite3.connect(self.filename)
+        if mode is not None:
+            os.chmod(self.filename, mode)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS meta '
+            '(key TEXT PRIMARY KEY, value TEXT NOT NULL)'
+        )
+        self.tables = {
+            name: Table(name) for (name,) in self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT IN ('meta', 'sqlite_sequence')"
+            )
+        }
+        self.records = {}
+
+    def __missing__(self, key):
+        """Read key from database on first access."""
+        if key in self.tables:
+            value = self._select(key)
+        else:
+            row = self.connection.execute(
+                'SELECT value FROM meta WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(key)
+            value = json.loads(row[0])
+        OrderedDict.__setitem__(self, key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        """Set key value and write it to database."""
+        OrderedDict.__setitem__(self, key, value)
+        self.dirty_keys.add(key)
+        if not isinstance(value, list):
+            data = json.dumps(value)
+            self.written_size += len(data)
+            self.connection.execute(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                (key, data)
+            )
+            return
+        table = self.get_table(key)
+        self.connection.execute('DELETE FROM "{}"'.format(key))
+        self.records[key] = {}
+        for i in value:
+            self._insert(table, i)
+
+    def clear(self):
+        """Remove all keys from memory and database."""
+        super(SQLitePersistentDict, self).clear()
+        for i in self.tables:
+            self.connection.execute('DROP TABLE "{}"'.format(i))
+        self.connection.execute('DELETE FROM meta')
+        self.tables = {}
+        self.records = {}
+
+    def get_table(self, key):
+        """Return table for key, create it if need."""
+        table = self.tables.get(key)
+        if table is None:
+            table = Table(key)
+            for i in table.create_statements():
+                self.connection.execute(i)
+            self.tables[key] = table
+        return table
+
+    def append_records(self, key, records):
+        """Append records to loaded list and write rows."""
+        if self.is_loaded(key):
+            OrderedDict.__getitem__(self, key).extend(records)
+        table = self.get_table(key)
+        for i in records:
+            self._insert(table, i)
+            self.mark_saved(key, i)
+
+    def remove_records(self, key, records):
+        """Remove records from loaded list and delete rows."""
+        if self.is_loaded(key):
+            stored = OrderedDict.__getitem__(self, key)
+            removed = set(id(i) for i in records)
+            stored[:] = [i for i in stored if id(i) not in removed]
+        cache = self.records.get(key, {})
+        identificators = [i.get('id') for i in records]
+        for i in identificators:
+            cache.pop(i, None)
+        self.connection.executemany(
+            'DELETE FROM "{}" WHERE "id" = ?'.format(self.get_table(key).name),
+            [(i,) for i in identificators]
+        )
+        for i in records:
+            self.mark_deleted(key, i)
+
+    def replace_records(self, key, pairs):
+        """Replace records of loaded list in place and update rows."""
+        if self.is_loaded(key):
+            stored = OrderedDict.__getitem__(self, key)
+            replaced = dict((id(old), new) for old, new in pairs)
+            for index, i in enumerate(stored):
+                new = replaced.get(id(i))
+                if new is not None:
+                    stored[index] = new
+        table = self.get_table(key)
+        for _, new in pairs:
+            self._update(table, new)
+            self.mark_saved(key, new)
+
+    def select_records(self, key, query):
+        """Return records selected by translated query or all ones."""
+        table = self.get_table(key)
+        compiled = table.compile(query)
+        if compiled is None:
+            return self.setdefault(key, [])
+        return self._select(key, *compiled)
+
+    def lookup_records(self, key, field, value):
+        """Return records with field value or None for not indexed field."""
+        column = self.get_table(key).field_columns.get(field)
+        if column is None:
+            return None
+        if value is None:
+            return []
+        return self._select(key, '"{}" = ?'.format(column), [value])
+
+    def stored_keys(self):
+        """Return list of keys from memory and database."""
+        keys = list(self.keys())
+        keys.extend(i for i in sorted(self.tables) if i not in keys)
+        keys.extend(
+            i for (i,) in self.connection.execute('SELECT key FROM meta')
+            if i not in keys
+        )
+        return keys
+
+    def sync(self):
+        """Commit changes to database when anything changed."""
+        if self.flag == 'r' or not self.dirty_keys:
+            return
+        self.connection.commit()
+        self.flushed(self.written_size)
+        self.written_size = 0
+
+    def _select(self, key, condition='1', params=()):
+        rows = self.connection.execute(
+            'SELECT "id", data FROM "{}" WHERE {} ORDER BY seq'.format(
+                key, condition
+            ),
+            params
+        )
+        cache = self.records.setdefault(key, {})
+        records = []
+        for identificator, data in rows:
+            record = cache.get(identificator)
+            if record is None:
+                record = json.loads(data)
+                if identificator is not None:
+                    cache[identificator] = record
+            records.append(record)
+        return records
+
+    def _update(self, table, record):
+        identificator = record.get('id')
+        self.records.setdefault(table.name, {})[identificator] = record
+        row = table.row(record)
+        self.written_size += len(row[-1])
+        cursor = self.connection.execute(
+            table.update_statement(), row + (identificator,)
+        )
+        if not cursor.rowcount:
+            self.connection.execute(table.insert_statement(), row)
+
+    def _insert(self, table, record):
+        identificator = record.get('id')
+        if identificator is not None:
+            self.records.setdefault(table.name, {})[identificator] = record
+        row = table.row(record)
+        self.written_size += len(row[-1])
+        self.connection.execute(table.insert_statement(), row)
+
+
+def _bindable_or_none(value):
+    return value if isinstance(value, BINDABLE_TYPES) else None
@@ -5,6 +5,7 @@ Strategy is some additional behaviour for storage.
 """
 import six
 from ..models.base import DeleteSets
+from ..models.terminal import SshConfig, Identity
 
 
 # pylint: disable=too-few-public-methods
@@ -19,6 +20,8 @@ class Strategy(object):
 class SaveStrategy(Strategy):
     """Saver strategy that saves relations on storage."""
 
+    is_unique_checked = True
+
     # pylint: disable=no-self-use,unused-argument
     def save_submodel(self, submodel, mapping):
         """Save submodels of model."""
@@ -41,30 +44,96 @@ class SaveStrategy(Strategy):
     def save(self, model):
         """Do extra action when model saved.
 
-        Save it's relations.
+        Save it's relations. Model is copied once, so the copy becomes
+        stored record and later changes of model fields do not touch it.
+        Remote instance is shared, so model gets state of stored record.
         """
-        model_copy = model.copy()
-        fk_fields = model.fk_field_names()
-        for field in fk_fields:
-            mapping = model.fields[field]
-            saved_submodel = self.serialize_relation(
-                getattr(model, field), mapping
-            )
-            setattr(model_copy, field, saved_submodel)
-        return model_copy
+        record = model.copy()
+        for field, mapping in model.get_schema().fk_fields:
+            record[field] = self.serialize_relation(model.get(field), mapping)
+        return record
 
 
 class RelatedSaveStrategy(SaveStrategy):
-    """Saver strategy that does not save relations."""
+    """Saver strategy that saves relations before model.
+
+    Relations are written only when they differ from stored records. Ssh
+    configs and invisible identities are shared by content: not synced
+    record with the same mergable fields is reused instead of saving new
+    one, and record referred by several models is copied on change.
+    """
+
+    content_shared_classes = (SshConfig, Identity)
 
     def save_submodel(self, submodel, mapping):
-        """Do not save any, barely return relation id."""
-        return self.storage.save(submodel).id
+        """Save relation and return its id."""
+        if isinstance(submodel, six.integer_types):
+            return submodel
+        if self.is_content_shared(submodel):
+            return self.save_shared_submodel(submodel).id
+        model = self.save(submodel)
+        if not model.id or self.is_changed(model):
+            self.store(submodel, model)
+        return model.id
+
+    def is_changed(self, model):
+        """Check that model differs from its stored record."""
+        records = self.storage.indexes.lookup(
+            model.set_name, model.id_name, model.id
+        )
+        return not records or records[0] != model
+
+    def is_content_shared(self, model):
+        """Check that model record could be shared by content."""
+        return (
+            isinstance(model, self.content_shared_classes) and
+            not model.get('is_visible')
+        )
+
+    def save_shared_submodel(self, submodel):
+        """Reuse record with the same content or save submodel."""
+        model = self.save(submodel)
+        fields = model.get_schema().content_fields
+        key = tuple(model.get(name, default) for name, default in fields)
+        record_ids = [
+            i['id'] for i in self.storage.indexes.lookup_content(
+                model.set_name, fields, key
+            ) if i['id'] == model.id or self.is_shareable(i)
+        ]
+        if record_ids:
+            submodel.id = model.id if model.id in record_ids else (
+                record_ids[0]
+            )
+            return submodel
+
+        if model.id and self.storage.constraints.count_referrers(model) > 1:
+            model.id = submodel.id = None
+            model.remote_instance = submodel.remote_instance = None
+        return self.store(submodel, model)
+
+    # pylint: disable=no-self-use
+    def is_shareable(self, record):
+        """Check that other models could refer record with same content.
+
+        Synced records are not shared, cloud keeps record per referrer.
+        """
+        return not (record.get('is_visible') or record.get('remote_instance'))
+
+    def store(self, submodel, model):
+        """Write model with saved relations as submodel record."""
+        if model.id:
+            self.storage.update(model)
+        else:
+            self.storage.create(model)
+        submodel.id = model.id
+        return submodel
 
 
 class SyncSaveStrategy(SaveStrategy):
     """Saver strategy for synced models."""
 
+    is_unique_checked = False
+
     def mark_model(self, model):
         """Change model state before saving."""
         model.mark_synced()
@@ -85,17 +154,24 @@ class RelatedGetStrategy(GetStrategy):
     def get(self, model):
         """Return model with whole relation tree."""
         result = super(RelatedGetStrategy, self).get(model)
-        fk_fields = model.fk_field_names()
-        for field in fk_fields:
-            mapping = model.fields[field]
+        for field, mapping in model.get_schema().fk_fields:
             submodel_id = getattr(result, field)
             if submodel_id:
-                submodel = self.storage.get_single_by_id(
-                    mapping.model, submodel_id
-                )
+                submodel = self.get_submodel(mapping.model, submodel_id)
                 setattr(result, field, submodel)
         return result
 
+    def get_submodel(self, model_class, identificator):
+        """Return related model shared through storage identity map."""
+        identity_map = self.storage.identity_map
+        submodel = identity_map.get(model_class, identificator)
+        if submodel is None:
+            submodel = self.storage.get_single_by_id(
+                model_class, identificator
+            )
+            identity_map.add(model_class, identificator, submodel)
+        return submodel
+
 
 class DeleteStrategy(Strategy):
     """Deleter strategy that completely delete model."""
@@ -110,41 +186,73 @@ class DeleteStrategy(Strategy):
         """Return what it gets."""
         return model
 
+    # pylint: disable=no-self-use
+    def delete_many(self, models):
+        """Return what it gets."""
+        return models
+
     def remove_intersection(self, deleted_sets):
         """Confirm delete (Need to create more suitable description)."""
 
+    def flush(self):
+        """Write changes kept in memory to storage."""
+
 
 class SoftDeleteStrategy(DeleteStrategy):
     """Deleter strategy that delete model and do small extra action.
 
     Extra action is that store model remote id in deleted_sets if any.
+    Delete sets are kept in memory and they are written to storage once
+    on transaction end.
     """
 
     delete_sets_class = DeleteSets
 
+    def __init__(self, storage):
+        """Construct strategy with not loaded delete sets."""
+        super(SoftDeleteStrategy, self).__init__(storage)
+        self.delete_sets = None
+        self.is_changed = False
+
+    def load_delete_sets(self):
+        """Return delete sets kept in memory, load them if need."""
+        if self.delete_sets is None:
+            try:
+                data = self.storage.low_get(self.delete_sets_class.set_name)
+            except KeyError:
+                data = {}
+            self.delete_sets = self.delete_sets_class(data)
+        return self.delete_sets
+
     def get_delete_sets(self):
-        """Retrieve delete objects from storage."""
-        try:
-            data = self.storage.low_get(self.delete_sets_class.set_name)
-        except KeyError:
-            data = {}
-        model = self.delete_sets_class(data)
-        return model
+        """Retrieve delete objects with id lists."""
+        return self.load_delete_sets().serialize()
 
     def set_delete_sets(self, deleted):
         """Store delete sets into the storage."""
         self.storage.low_set(self.delete_sets_class.set_name, deleted)
+        self.delete_sets = None
+        self.is_changed = False
 
     def delete(self, model):
         """Store remote_id of model in delete sets."""
-        delete_sets = self.get_delete_sets()
-        delete_sets.store(model)
-        self.set_delete_sets(delete_sets)
+        self.delete_many([model])
         return model
 
+    def delete_many(self, models):
+        """Store remote_id of every model in delete sets."""
+        self.load_delete_sets().store_many(models)
+        self.is_changed = True
+        return models
+
     def remove_intersection(self, deleted_sets):
         """Remove from deleted_sets intersection with sets passed."""
-        delete_sets = self.get_delete_sets()
+        delete_sets = self.load_delete_sets()
         for set_name, id_list in deleted_sets.items():
             delete_sets.remove_all(set_name, id_list)
-        self.set_delete_sets(delete_sets)
+        self.is_changed = True
+
+    def flush(self):
+        """Write delete sets to storage when they were changed."""
+        if self.is_changed:
+            self.set_delete_sets(self.delete_sets.serialize())
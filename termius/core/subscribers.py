@@ -2,7 +2,6 @@
 """Handlers for application signals."""
 import six
 from .models.terminal import clean_order
-from .storage.strategies import SoftDeleteStrategy
 
 
 # pylint: disable=unused-argument
@@ -25,6 +24,18 @@ def delete_ssh_key(sender, command, instance):
         path.unlink()
 
 
+def store_ssh_keys(sender, command, instances):
+    """Write private keys of saved batch to files."""
+    for i in instances:
+        store_ssh_key(sender, command, i)
+
+
+def delete_ssh_keys(sender, command, instances):
+    """Delete private key files of deleted batch."""
+    for i in instances:
+        delete_ssh_key(sender, command, i)
+
+
 def clean_data(sender, command, email):
     """Clean data for account with email."""
     with command.storage:
@@ -33,9 +44,7 @@ def clean_data(sender, command, email):
 
 def _clean_data(storage):
     for model in clean_order:
-        instances = storage.get_all(model)
-        for i in instances:
-            storage.delete(i)
+        storage.truncate(model, record_deletes=False)
 
-    deleted_set = SoftDeleteStrategy(storage).get_delete_sets()
+    deleted_set = storage.strategies.deleter.get_delete_sets()
     storage.confirm_delete(deleted_set)
@@ -10,3 +10,4 @@ from .tag import TagsCommand  # noqa
 from .info import InfoCommand  # noqa
 from .connect import ConnectCommand  # noqa
 from .init import InitCommand # noqa
+from .storage import MigrateStorageCommand, GarbageCollectCommand  # noqa
@@ -1,10 +1,9 @@
 # -*- coding: utf-8 -*-
 """Module with Group commands."""
-import functools
 from operator import attrgetter
 from cached_property import cached_property
 from ..core.commands import DetailCommand, ListCommand
-from ..core.commands.mixins import GroupStackGetterMixin
+from ..core.commands.mixins import GroupStackGetterMixin, PaginateMixin
 from ..core.models.terminal import Group
 from ..core.commands.single import RequiredOptions
 from ..core.storage.strategies import RelatedGetStrategy
@@ -48,11 +47,12 @@ class GroupCommand(GroupStackGetterMixin, DetailCommand):
     def validate(self, instance):
         """Raise an error when group have cyclic folding."""
         group_id = instance.id
-        if not group_id:
+        parent_group = instance.parent_group
+        if not group_id or not parent_group:
             return
-        group_stack = self.get_group_stack(instance)
-        not_unique = any([i.id for i in group_stack if i.id == group_id])
-        if not_unique:
+        parent_group_id = getattr(parent_group, 'id', parent_group)
+        parent_group_stack = self.get_group_tree().ancestors(parent_group_id)
+        if group_id in [parent_group_id] + parent_group_stack:
             raise InvalidArgumentException('Cyclic group founded!')
 
     def serialize_args(self, args, instance=None):
@@ -65,7 +65,7 @@ class GroupCommand(GroupStackGetterMixin, DetailCommand):
         return instance
 
 
-class GroupsCommand(ListCommand):
+class GroupsCommand(GroupStackGetterMixin, PaginateMixin, ListCommand):
     """list all groups"""
 
     model_class = Group
@@ -82,7 +82,7 @@ class GroupsCommand(ListCommand):
             'group', nargs='?', metavar='GROUP_ID or GROUP_NAME',
             help='list groups in the group with ID or NAME'
         )
-        return parser
+        return self.add_pagination_arguments(parser)
 
     # pylint: disable=unused-argument
     def take_action(self, parsed_args):
@@ -91,24 +91,29 @@ class GroupsCommand(ListCommand):
         groups = self.get_groups(parent_group_id)
         if parsed_args.recursive:
             groups = self.collect_group_recursivle(groups)
-        return self.prepare_result(groups)
+        return self.prepare_result(self.paginate(groups, parsed_args))
 
     def get_groups(self, group_id):
-        """Retrieve all child groups of passed group."""
+        """Retrieve result set of child groups of passed group."""
         if group_id:
             filter_operation = {'parent_group.id': group_id}
         else:
             filter_operation = {'parent_group': None}
-        return self.storage.filter(Group, **filter_operation)
+        return self.storage.query(Group).filter(**filter_operation)
 
     def get_parent_group_id(self, args):
         """Return parent group id  or None from command line arguments."""
         return args.group and self.get_relation(Group, args.group).id
 
     def collect_group_recursivle(self, top_groups):
-        """Return all child groups of top_groups."""
-        return functools.reduce(self._collect_subgroup, top_groups, [])
-
-    def _collect_subgroup(self, accumulator, group):
-        children = self.get_groups(group.id)
-        return accumulator + [group] + self.collect_group_recursivle(children)
+        """Return top_groups with all their child groups."""
+        group_tree = self.get_group_tree()
+        group_ids = []
+        for i in top_groups:
+            group_ids.append(i.id)
+            group_ids.extend(group_tree.descendants(i.id))
+        groups = self.storage.query(Group).filter(**{
+            'id.rcontains': group_ids
+        })
+        groups_by_id = {i.id: i for i in groups}
+        return [groups_by_id[i] for i in group_ids if i in groups_by_id]
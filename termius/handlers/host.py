@@ -4,9 +4,11 @@ from operator import attrgetter
 from cached_property import cached_property
 from ..core.commands import DetailCommand, ListCommand
 from ..core.commands.single import RequiredOptions
-from ..core.commands.mixins import GroupStackGetterMixin
+from ..core.commands.mixins import GroupStackGetterMixin, PaginateMixin
+from ..core.commands.arg_types import typed_query_condition
+from ..core.storage.query import QueryOperator
 from ..core.storage.strategies import RelatedGetStrategy
-from ..core.models.terminal import Host, Group, TagHost
+from ..core.models.terminal import Host, Group
 from .taghost import TagListArgs
 from .ssh_config import SshConfigArgs
 
@@ -75,7 +77,7 @@ class HostCommand(DetailCommand):
         return instance
 
 
-class HostsCommand(GroupStackGetterMixin, ListCommand):
+class HostsCommand(GroupStackGetterMixin, PaginateMixin, ListCommand):
     """list all hosts"""
 
     model_class = Host
@@ -91,14 +93,33 @@ class HostsCommand(GroupStackGetterMixin, ListCommand):
         parser.add_argument(
             '-t', '--tag', metavar='TAG',
             action='append', default=[], dest='tags',
-            help='specify the TAG(s) for a host (can be repeated)'
+            help='list hosts with any of TAG(s) (can be repeated)'
+        )
+        parser.add_argument(
+            '--all-tags', action='store_true',
+            help='list hosts with every TAG instead of any'
+        )
+        parser.add_argument(
+            '--without-tag', metavar='TAG',
+            action='append', default=[], dest='excluded_tags',
+            help='skip hosts with the TAG(s) (can be repeated)'
         )
         parser.add_argument(
             '-g', '--group', metavar='ID or NAME',
             help=('list hosts in the group with ID or NAME'
                   '(current group by default)')
         )
-        return parser
+        parser.add_argument(
+            '-w', '--where', metavar='CONDITION',
+            type=typed_query_condition(Host),
+            action='append', default=[], dest='conditions',
+            help=('list hosts matched CONDITION like "address cidr '
+                  '10.0.0.0/8" or "ssh_config.port gt 22", operators are '
+                  '{} (can be repeated)').format(
+                      ', '.join(QueryOperator.operators)
+                  )
+        )
+        return self.add_pagination_arguments(parser)
 
     # pylint: disable=unused-argument
     def take_action(self, parsed_args):
@@ -106,34 +127,35 @@ class HostsCommand(GroupStackGetterMixin, ListCommand):
         group = self.get_group(parsed_args)
         hosts = self.get_hosts(group)
         if parsed_args.tags:
-            hosts = self.filter_host_by_tags(hosts, parsed_args.tags)
-        return self.prepare_result(hosts)
+            union = all if parsed_args.all_tags else any
+            hosts = self.filter_host_by_tags(hosts, parsed_args.tags, union)
+        if parsed_args.excluded_tags:
+            hosts = self.exclude_host_by_tags(
+                hosts, parsed_args.excluded_tags
+            )
+        for lookup, value in parsed_args.conditions:
+            hosts = hosts.filter(**{lookup: value})
+        return self.prepare_result(self.paginate(hosts, parsed_args))
 
     def get_hosts(self, parent_group):
-        """Get host list by group id."""
+        """Get host result set by group id."""
+        hosts = self.storage.query(Host)
         if not parent_group:
-            return self.storage.get_all(Host)
-        group_stack = self.get_group_stack(parent_group)
-        group_id_stack = [i.id for i in group_stack]
-        filter_operation = {'group': None}
-        if group_id_stack:
-            filter_operation['group.id.rcontains'] = group_id_stack
-        return self.storage.exclude(Host, any, **filter_operation)
+            return hosts
+        group_tree = self.get_group_tree()
+        group_ids = [parent_group.id] + group_tree.descendants(parent_group.id)
+        return hosts.filter(**{'group.id.rcontains': group_ids})
 
     def get_group(self, args):
         """Get group id by group id or label."""
         return args.group and self.get_relation(Group, args.group)
 
-    def filter_host_by_tags(self, hosts, tags):
-        """Filter host list by tag csv list."""
-        tags = self.taglist_args.get_tag_instances(tags)
-        tag_ids = [i.id for i in tags]
-        host_ids = [i.id for i in hosts]
-        taghost_instances = self.storage.filter(TagHost, all, **{
-            'tag.id.rcontains': tag_ids
-        })
-        filtered_host_ids = {i.host.id for i in taghost_instances}
-        intersected_host_ids = set(host_ids) & filtered_host_ids
-        return self.storage.filter(
-            Host, **{'id.rcontains': intersected_host_ids}
-        )
+    def filter_host_by_tags(self, hosts, tags, union=any):
+        """Filter host result set by any or all of tag labels."""
+        filtered_host_ids = self.taglist_args.get_host_ids(tags, union)
+        return hosts.filter(**{'id.rcontains': filtered_host_ids})
+
+    def exclude_host_by_tags(self, hosts, tags):
+        """Exclude hosts with any of tag labels from host result set."""
+        excluded_host_ids = self.taglist_args.get_host_ids(tags)
+        return hosts.exclude(**{'id.rcontains': excluded_host_ids})
@@ -2,6 +2,7 @@
 """Module with Snippet commands."""
 from ..core.commands import ListCommand, DetailCommand
 from ..core.commands.single import RequiredOptions
+from ..core.commands.mixins import PaginateMixin
 from ..core.models.terminal import Snippet
 
 
@@ -20,7 +21,16 @@ class SnippetCommand(DetailCommand):
         return parser
 
 
-class SnippetsCommand(ListCommand):
+class SnippetsCommand(PaginateMixin, ListCommand):
     """list all snippets"""
 
     model_class = Snippet
+
+    def extend_parser(self, parser):
+        """Add more arguments to parser."""
+        return self.add_pagination_arguments(parser)
+
+    def take_action(self, parsed_args):
+        """Process CLI call."""
+        snippets = self.storage.query(Snippet)
+        return self.prepare_result(self.paginate(snippets, parsed_args))
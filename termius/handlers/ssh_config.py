@@ -127,12 +127,18 @@ class SshConfigArgs(ArgModelSerializerMixin, object):
         old = instance and instance.identity
         new = self.serialize_identity_field(args, old)
         if new and old and new.is_visible and not old.is_visible:
-            self.clean_invisible_identity(old)
+            self.clean_invisible_identity(old, instance)
         return new
 
-    def clean_invisible_identity(self, identity):
-        """Stub cleaning identity."""
-        self.command.storage.delete(identity)
+    def clean_invisible_identity(self, identity, ssh_config):
+        """Delete invisible identity unless it is shared."""
+        storage = self.command.storage
+        is_shared = (
+            storage.constraints.count_referrers(identity) > 1 or
+            storage.constraints.count_referrers(ssh_config) > 1
+        )
+        if not is_shared:
+            storage.delete(identity)
 
     def serialize_identity_field(self, args, instance):
         """Serialize identity."""
@@ -4,7 +4,9 @@ from operator import attrgetter
 from pathlib2 import Path
 from cached_property import cached_property
 from ..core.commands.single import RequiredOptions
-from ..core.exceptions import InvalidArgumentException
+from ..core.exceptions import (
+    InvalidArgumentException, DoesNotExistException, TooManyEntriesException
+)
 from ..core.commands import DetailCommand, ListCommand
 from ..core.models.terminal import SshKey
 
@@ -26,10 +28,15 @@ class SshKeyGeneratorMixin(object):
 
     def validate_ssh_key(self, instance, storage):
         """Raise an error when any instances exist with same label."""
-        with_same_label = storage.filter(
-            SshKey, **{'label': instance.label, 'id.ne': instance.id}
-        )
-        if with_same_label:
+        try:
+            is_same_label_exist = storage.get_by_unique(
+                SshKey, label=instance.label
+            ).id != instance.id
+        except DoesNotExistException:
+            is_same_label_exist = False
+        except TooManyEntriesException:
+            is_same_label_exist = True
+        if is_same_label_exist:
             raise InvalidArgumentException('Instances with same label exists.')
 
 
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Module with storage maintenance commands."""
+from ..core.commands import AbstractCommand
+from ..core.storage import ApplicationStorage
+from ..core.storage.collector import GarbageCollector
+
+
+class MigrateStorageCommand(AbstractCommand):
+    """move local data to another storage driver"""
+
+    def extend_parser(self, parser):
+        """Add more arguments to parser."""
+        parser.add_argument(
+            '-d', '--driver', required=True,
+            choices=sorted(ApplicationStorage.drivers),
+            help='storage driver to move data to'
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        """Process CLI call."""
+        self.storage.migrate(parsed_args.driver)
+        self.config.set('Storage', 'driver', parsed_args.driver)
+        self.config.write()
+        self.log.info('Storage migrated to %s driver', parsed_args.driver)
+
+
+class GarbageCollectCommand(AbstractCommand):
+    """remove ssh configs and identities which nothing refers to"""
+
+    def extend_parser(self, parser):
+        """Add more arguments to parser."""
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='report orphaned entries without removing them'
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        """Process CLI call."""
+        collector = GarbageCollector(self.storage)
+        if parsed_args.dry_run:
+            result = collector.collect()
+            self.log.info(
+                'Found %s orphaned entries, %s bytes.',
+                len(result.models), result.size
+            )
+            return
+        with self.storage:
+            result = collector.sweep()
+        self.log.info(
+            'Removed %s orphaned entries, reclaimed %s bytes.',
+            len(result.models), result.size
+        )
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 """Module with tag list command helpers."""
-from ..core.exceptions import DoesNotExistException
+from collections import OrderedDict
+
+from ..core.exceptions import (
+    DoesNotExistException, TooManyEntriesException
+)
 from ..core.models.terminal import Tag, TagHost
 
 
@@ -32,29 +36,42 @@ class TagListArgs(object):
 
     def delete_outdated_taghost(self, delete_taghosts):
         """Delete tag host instance."""
-        for i in delete_taghosts:
-            self.storage.delete(i)
+        self.storage.delete_many(delete_taghosts)
 
     def create_taghosts(self, host, tag_list):
         """Create new binding to host and to tag list."""
         taghost_list = [TagHost(host=host, tag=i) for i in tag_list]
-        for i in taghost_list:
-            self.storage.save(i)
+        self.storage.save_many(taghost_list)
 
     def get_or_create_tag_instances(self, tag_label_list):
-        """Get tag list from list of tag label."""
-        tags = [
-            self.get_or_create_tag(i) for i in tag_label_list
-        ]
-        return tags
-
-    def get_or_create_tag(self, tag_label):
-        """Get or create new tag instance by tag_label."""
-        try:
-            return self.storage.get(Tag, **{'label': tag_label})
-        except DoesNotExistException:
-            return self.storage.create(Tag(label=tag_label))
+        """Get tag list from list of tag label, create missed in batch."""
+        tags = {}
+        missed_labels = []
+        for i in OrderedDict.fromkeys(tag_label_list):
+            try:
+                tags[i] = self.storage.get_by_unique(Tag, label=i)
+            except DoesNotExistException:
+                missed_labels.append(i)
+            except TooManyEntriesException:
+                tags[i] = self.storage.filter(Tag, label=i)[0]
+        new_tags = self.storage.save_many(
+            [Tag(label=i) for i in missed_labels]
+        )
+        tags.update((i.label, i) for i in new_tags)
+        return [tags[i] for i in tag_label_list]
 
     def get_tag_instances(self, tag_label_list):
         """Get tag list from list of tag label."""
         return self.storage.filter(Tag, **{'label.rcontains': tag_label_list})
+
+    def get_host_ids(self, tag_label_list, union=any):
+        """Return ids of hosts tagged with any or all of tag labels."""
+        tag_ids = [i.id for i in self.get_tag_instances(tag_label_list)]
+        tag_index = self.storage.indexes.get_relation_index(
+            TagHost.set_name, 'tag', 'host'
+        )
+        if union is all:
+            if len(tag_ids) < len(set(tag_label_list)):
+                return set()
+            return tag_index.lookup_all(tag_ids)
+        return tag_index.lookup_any(tag_ids)
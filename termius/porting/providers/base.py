@@ -4,6 +4,10 @@ import abc
 import six
 
 from ...core.commands.mixins import SshConfigMergerMixin
+from ...core.exceptions import (
+    DoesNotExistException, TooManyEntriesException
+)
+from ...core.models.base import Model
 from ...core.models.terminal import Host, SshKey
 
 
@@ -30,11 +34,42 @@ class BasePortingProvider(SshConfigMergerMixin):
         hosts_to_import = self.provider_hosts()
 
         with self.storage:
+            new_hosts = []
             for host in hosts_to_import:
                 if not self.is_host_exists(host):
-                    self.storage.save(host)
+                    new_hosts.append(host)
                 else:
                     self.skipped_hosts.append(host.label)
+            self.assign_ssh_keys(new_hosts)
+            self.storage.save_many(new_hosts)
+            self.skipped_hosts.extend(i.label for i in new_hosts if not i.id)
+
+    def assign_ssh_keys(self, hosts):
+        """Replace ssh keys of host trees with single instance per label.
+
+        Ssh key labels are unique, so keys with the same label are saved
+        once and existed key with the label is updated.
+        """
+        keys = {}
+        visited = set()
+        stack = list(hosts)
+        while stack:
+            model = stack.pop()
+            if id(model) in visited:
+                continue
+            visited.add(id(model))
+            for field, _ in model.get_schema().fk_fields:
+                submodel = model.get(field)
+                if isinstance(submodel, SshKey):
+                    model[field] = self.get_unique_ssh_key(keys, submodel)
+                elif isinstance(submodel, Model):
+                    stack.append(submodel)
+
+    def get_unique_ssh_key(self, keys, ssh_key):
+        """Return single ssh key instance per label from keys."""
+        if ssh_key.label not in keys:
+            keys[ssh_key.label] = self.assign_ssh_key_ids(ssh_key)
+        return keys[ssh_key.label]
 
     def assign_ssh_key_ids(self, new_ssh_key):
         """Assign to new ssh key existed ssh key id to update it."""
@@ -56,5 +91,9 @@ class BasePortingProvider(SshConfigMergerMixin):
 
     def get_existed_key(self, new_ssh_key):
         """Retrieve exited key for new key."""
-        existed_keys = self.storage.filter(SshKey, label=new_ssh_key.label)
-        return existed_keys and existed_keys[0]
+        try:
+            return self.storage.get_by_unique(SshKey, label=new_ssh_key.label)
+        except DoesNotExistException:
+            return None
+        except TooManyEntriesException:
+            return self.storage.filter(SshKey, label=new_ssh_key.label)[0]
@@ -13,6 +13,10 @@ class SSHConfigHostAdapter(SshConfigMergerMixin):
 
     default_user = environ.get('USER', None)
 
+    def __init__(self, storage=None):
+        """Construct adapter, merged ssh configs are cached in storage."""
+        self.storage = storage
+
     def get_instance_ssh_key_label(self, ssh_config):
         """Retrieve the ssh_key lable."""
         if ssh_config['identity'] and ssh_config['identity'].get('ssh_key'):
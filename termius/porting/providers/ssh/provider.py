@@ -26,7 +26,7 @@ class SSHPortingProvider(BasePortingProvider):
         """Contruct new service to sync ssh config."""
         super(SSHPortingProvider, self).__init__(*args, **kwargs)
         self.user_config = expanduser(self.user_config)
-        self.adapter = SSHConfigHostAdapter()
+        self.adapter = SSHConfigHostAdapter(self.storage)
 
     def export_hosts(self):
         """Export app hosts to ssh config syntax."""
@@ -0,0 +1,37 @@
+#!/usr/bin/env bats
+load test_helper
+
+
+setup() {
+    clean_storage || true
+}
+
+@test "gc help by arg" {
+    run termius gc --help
+    [ "$status" -eq 0 ]
+}
+
+@test "gc help command" {
+    run termius help gc
+    [ "$status" -eq 0 ]
+}
+
+@test "gc removes ssh config of deleted host" {
+    termius host -L test --address localhost --port 2022 --username user
+    termius host --delete test
+    run termius gc --dry-run
+    [ "$status" -eq 0 ]
+    [ $(get_models_set_length 'sshconfig_set') -eq 1 ]
+    run termius gc
+    [ "$status" -eq 0 ]
+    [ $(get_models_set_length 'sshconfig_set') -eq 0 ]
+    [ $(get_models_set_length 'identity_set') -eq 0 ]
+}
+
+@test "gc keeps ssh config of host" {
+    termius host -L test --address localhost --port 2022 --username user
+    run termius gc
+    [ "$status" -eq 0 ]
+    [ $(get_models_set_length 'sshconfig_set') -eq 1 ]
+    [ $(get_models_set_length 'identity_set') -eq 1 ]
+}
@@ -145,3 +145,12 @@ setup() {
     [ "$status" -eq 0 ]
     [ $(get_models_set_length 'group_set') -eq 0 ]
 }
+
+@test "Delete group with hosts" {
+    group=$(termius group -L 'test group')
+    host=$(termius host -L test --address localhost --group $group)
+    run termius group --delete $group
+    [ "$status" -eq 0 ]
+    [ $(get_models_set_length 'group_set') -eq 0 ]
+    [ $(get_model_field 'host_set' $host 'group') = null ]
+}
@@ -38,7 +38,9 @@ setup() {
     [ "$status" -eq 0 ]
     [ $(get_models_set_length 'host_set') -eq 1 ]
     [ $(get_models_set_length 'sshconfig_set') -eq 2 ]
-    [ $(get_models_set_length 'identity_set') -eq 2 ]
+    # Group and host ssh configs have equal empty hidden identities, they
+    # share one record by content until push splits it per ssh config.
+    [ $(get_models_set_length 'identity_set') -eq 1 ]
     host=${lines[1]}
     [ "$(get_model_field 'host_set' $host 'label')" = '"test"' ]
     [ $(get_model_field 'host_set' $host 'group') = $group ]
@@ -59,6 +61,19 @@ setup() {
     [ $(get_models_set_length 'host_set') -eq 3 ]
 }
 
+@test "Add hosts with same ssh config" {
+    first=$(termius host -L first --port 2022 --address 127.0.0.1 --username root)
+    second=$(termius host -L second --port 2022 --address localhost --username root)
+    [ $(get_models_set_length 'sshconfig_set') -eq 1 ]
+    [ $(get_models_set_length 'identity_set') -eq 1 ]
+    run termius host --port 22 $first
+    [ "$status" -eq 0 ]
+    [ $(get_models_set_length 'sshconfig_set') -eq 2 ]
+    [ $(get_models_set_length 'identity_set') -eq 1 ]
+    ssh_config=$(get_model_field 'host_set' $second 'ssh_config')
+    [ $(get_model_field 'sshconfig_set' $ssh_config 'port') -eq 2022 ]
+}
+
 @test "Update host" {
     host=$(termius host -L test_3 --port 22 --address google.com --username root)
     run termius host --address google --username ROOT $host
@@ -242,3 +257,12 @@ assert_host_has_tag() {
     hosts="$(get_model_field 'taghost_set' $tag 'host' 'tag')"
     [ -z "${hosts##*$1*}" ]
 }
+
+@test "Delete host with tags" {
+    host=$(termius host -L test --address localhost -t A -t B)
+    run termius host --delete $host
+    [ "$status" -eq 0 ]
+    [ $(get_models_set_length 'host_set') -eq 0 ]
+    [ $(get_models_set_length 'taghost_set') -eq 0 ]
+    [ $(get_models_set_length 'tag_set') -eq 2 ]
+}
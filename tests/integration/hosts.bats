@@ -87,6 +87,34 @@ setup() {
     [ $(get_models_set_length 'host_set') -eq 3 ]
 }
 
+@test "List hosts without hosts of other groups" {
+    group=$(termius group --port 2022 -L group)
+    other_group=$(termius group --port 2022 -L other)
+    host_id=$(termius host -L test --group $group --address localhost)
+    termius host -L test --group $other_group --address localhost
+
+    run termius hosts --group $group -f csv -c id
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = "$host_id" ]
+    [ "${lines[2]}" = "" ]
+}
+
+@test "List hosts filter by every tag and without a tag" {
+    host_id=$(termius host -L first --address localhost -t A -t B)
+    other_host_id=$(termius host -L second --address localhost -t B -t C)
+    termius host -L third --address localhost -t A
+
+    run termius hosts --tag A --tag B --all-tags -f csv -c id
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = "$host_id" ]
+    [ "${lines[2]}" = "" ]
+
+    run termius hosts --tag B --without-tag A -f csv -c id
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = "$other_host_id" ]
+    [ "${lines[2]}" = "" ]
+}
+
 @test "List hosts in a group filter by the tag" {
     group=$(termius group --port 2022 -L group)
     host_id=$(termius host -L test --group $group --address localhost --username root -t A)
@@ -109,3 +137,51 @@ setup() {
     [ "${lines[2]}" = "" ]
     [ $(get_models_set_length 'host_set') -eq 1 ]
 }
+
+@test "List hosts page ordered by label" {
+    termius host -L c --address localhost
+    termius host -L a --address localhost
+    termius host -L b --address localhost
+
+    run termius hosts --order-by label --offset 1 --limit 1 -f csv -c label
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = '"b"' ]
+    [ "${lines[2]}" = "" ]
+}
+
+@test "List hosts where address is in network" {
+    termius host -L a --address 10.20.1.5
+    termius host -L b --address 10.30.1.5
+    termius host -L c --address example.com
+
+    run termius hosts --where 'address cidr 10.20.0.0/16' -f csv -c label
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = '"a"' ]
+    [ "${lines[2]}" = "" ]
+
+    run termius hosts --where 'label glob [bc]' --where 'address regex com$' -f csv -c label
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = '"c"' ]
+    [ "${lines[2]}" = "" ]
+}
+
+@test "List hosts where port is greater than number" {
+    termius host -L a --address localhost --port 3
+    termius host -L b --address localhost --port 2222
+    termius host -L c --address localhost --port 22
+
+    run termius hosts --where 'ssh_config.port gt 22' -f csv -c label
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = '"b"' ]
+    [ "${lines[2]}" = "" ]
+}
+
+@test "List hosts where port is greater than number and some hosts have no port" {
+    termius host -L a --address localhost
+    termius host -L b --address localhost --port 2222
+
+    run termius hosts --where 'ssh_config.port gt 22' -f csv -c label
+    [ "$status" -eq 0 ]
+    [ "${lines[1]}" = '"b"' ]
+    [ "${lines[2]}" = "" ]
+}
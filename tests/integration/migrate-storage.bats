@@ -0,0 +1,38 @@
+#!/usr/bin/env bats
+load test_helper
+
+
+setup() {
+    clean_storage || true
+    rm ~/.termius/storage.sqlite3 || true
+}
+
+teardown() {
+    termius migrate-storage --driver json || true
+}
+
+@test "migrate-storage help by arg" {
+    run termius migrate-storage --help
+    [ "$status" -eq 0 ]
+}
+
+@test "migrate-storage help command" {
+    run termius help migrate-storage
+    [ "$status" -eq 0 ]
+}
+
+@test "migrate-storage to sqlite and back" {
+    host=$(termius host -L test --address localhost)
+    run termius migrate-storage --driver sqlite
+    [ "$status" -eq 0 ]
+    [ "$(termius hosts -c id -f value)" = "$host" ]
+    termius host -L second --address 127.0.0.1
+    run termius migrate-storage --driver json
+    [ "$status" -eq 0 ]
+    [ $(get_models_set_length 'host_set') -eq 2 ]
+}
+
+@test "migrate-storage unknown driver" {
+    run termius migrate-storage --driver unknown
+    [ "$status" -eq 2 ]
+}
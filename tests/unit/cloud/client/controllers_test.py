@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import shutil
+import tempfile
+from mock import Mock, patch
+from ...core.storage.storage_test import StrategyCase
+from .cryptor_test import generate_cryptor, config_factory
+from termius.cloud.client.controllers import ApiController
+from termius.cloud.client.transformers.many import BulkTransformer
+from termius.core.storage.strategies import (
+    RelatedGetStrategy, SyncSaveStrategy
+)
+from termius.core.settings import Config
+from termius.core.models.terminal import Host, SshConfig
+
+
+class ApiControllerTest(StrategyCase):
+
+    get_strategy_class = RelatedGetStrategy
+    save_strategy_class = SyncSaveStrategy
+
+    def setUp(self):
+        super(ApiControllerTest, self).setUp()
+        self.app_tempdir = tempfile.mkdtemp()
+        config = Config(Mock(**{'app.directory_path': self.app_tempdir}))
+        config.set('User', 'username', 'username')
+        config.set('User', 'apikey', 'apikey')
+        config.set('CloudSynchronization', 'last_synced', 'last_synced')
+        self.controller = ApiController(
+            self.storage, config, generate_cryptor(**config_factory('1'))
+        )
+        self.controller.api = Mock()
+
+    def tearDown(self):
+        super(ApiControllerTest, self).tearDown()
+        shutil.rmtree(self.app_tempdir)
+
+    @patch.object(BulkTransformer, 'to_model', Mock(return_value={
+        'last_synced': 'now'
+    }))
+    def test_post_bulk_sends_shared_ssh_config_per_host(self):
+        ssh_config = self.storage.save(SshConfig(port=2))
+        for label in ('first', 'second'):
+            self.storage.save(Host(label=label, ssh_config=ssh_config.id))
+
+        self.controller.post_bulk()
+        payload = self.controller.api.post.call_args[0][1]
+        self.assertEqual(len(payload['sshconfig_set']), 2)
+        self.assertEqual(
+            len(set(i['ssh_config'] for i in payload['host_set'])), 2
+        )
+        self.assertEqual(len(self.storage.get_all(SshConfig)), 2)
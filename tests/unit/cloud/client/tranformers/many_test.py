@@ -170,6 +170,16 @@ class BulkTransformerTest(StrategyCase):
             payload['host_set'][0]['label']
         ))
 
+    def test_payload_does_not_change_storage(self):
+        self.transformer = self.get_transformer()
+        ssh_config = self.storage.save(SshConfig(port=2))
+        for label in ('first', 'second'):
+            self.storage.save(Host(label=label, ssh_config=ssh_config.id))
+
+        payload = self.transformer.to_payload(dict(last_synced=''))
+        self.assertEqual(len(payload['sshconfig_set']), 1)
+        self.assertEqual(len(self.storage.get_all(SshConfig)), 1)
+
     def test_bad_encrytped_data_no_in_storage(self):
         self.transformer = self.get_transformer()
 
@@ -234,6 +244,68 @@ class BulkTransformerTest(StrategyCase):
         )
         self.assertEqual(self.storage.get_all(Host), [])
 
+    def test_sent_delete_sets_are_compacted(self):
+        self.transformer = self.get_transformer()
+        hosts = [
+            self.storage.save(Host(
+                address='host', remote_instance=RemoteInstance(id=i)
+            )) for i in range(2)
+        ]
+        self.storage.delete(hosts[0])
+
+        payload = self.transformer.to_payload(dict(last_synced=''))
+        self.assertEqual(payload['delete_sets'], {'host_set': [0]})
+
+        self.storage.delete(hosts[1])
+        self.transformer.to_model(dict(
+            now='',
+            deleted_sets=self.empty_set(),
+            **self.empty_set()
+        ))
+        self.assertEqual(
+            self.storage.strategies.deleter.get_delete_sets(),
+            {'host_set': [1]}
+        )
+
+    def test_foreign_local_id_is_not_trusted(self):
+        self.transformer = self.get_transformer()
+        synced_host = self.storage.save(Host(
+            label='synced', remote_instance=RemoteInstance(id=1)
+        ))
+        sent_host = self.storage.save(Host(label='sent'))
+
+        last_synced_data = dict(
+            now='',
+            deleted_sets=self.empty_set(),
+            **self.empty_set()
+        )
+        last_synced_data['host_set'] = [
+            {
+                'id': remote_id,
+                'local_id': local_id,
+                'label': self.cryptor.encrypt(label),
+                'interaction_date': '',
+                'address': None,
+                'group': None,
+                'ssh_config': None,
+            }
+            for remote_id, local_id, label in (
+                (5, synced_host.id, 'foreign'), (6, sent_host.id, 'sent'),
+            )
+        ]
+        self.transformer.to_model(last_synced_data)
+
+        self.assertEqual(
+            self.storage.get_by_remote_id(Host, 1).label, 'synced'
+        )
+        foreign_host = self.storage.get_by_remote_id(Host, 5)
+        self.assertEqual(foreign_host.label, 'foreign')
+        self.assertNotIn(foreign_host.id, (synced_host.id, sent_host.id))
+        self.assertEqual(
+            self.storage.get_by_remote_id(Host, 6).id, sent_host.id
+        )
+        self.assertEqual(len(self.storage.get_all(Host)), 3)
+
     def _clean_dir(self, dir_path):
         [self._clean_dir(i) for i in dir_path.iterdir() if i.is_dir()]
         [i.unlink() for i in dir_path.iterdir() if i.is_file()]
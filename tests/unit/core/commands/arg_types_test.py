@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+from termius.core.commands.arg_types import typed_query_condition
+from termius.core.models.terminal import Host
+
+
+class TypedQueryConditionCase(TestCase):
+
+    def setUp(self):
+        self.query_condition = typed_query_condition(Host)
+
+    def test_coerce_value_to_field_type(self):
+        self.assertEqual(
+            self.query_condition('ssh_config.port gt 22'),
+            ('ssh_config.port.gt', 22)
+        )
+        self.assertEqual(
+            self.query_condition('ssh_config.use_ssh_key eq yes'),
+            ('ssh_config.use_ssh_key.eq', True)
+        )
+        self.assertEqual(
+            self.query_condition('group.id ne 2'), ('group.id.ne', 2)
+        )
+
+    def test_keep_string_value(self):
+        self.assertEqual(
+            self.query_condition('address cidr 10.0.0.0/8'),
+            ('address.cidr', '10.0.0.0/8')
+        )
+        self.assertEqual(
+            self.query_condition('label eq 22'), ('label.eq', '22')
+        )
+        self.assertEqual(
+            self.query_condition('ssh_config.port glob 2*'),
+            ('ssh_config.port.glob', '2*')
+        )
+
+    def test_invalid_value(self):
+        with self.assertRaises(ValueError):
+            self.query_condition('ssh_config.port gt many')
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import shutil
+import tempfile
+from mock import Mock
+from unittest import TestCase
+from termius.core.commands.mixins import SshConfigMergerMixin
+from termius.core.models.terminal import Host, Group, SshConfig, Identity
+from termius.core.storage import ApplicationStorage
+from termius.core.storage.strategies import (
+    RelatedGetStrategy, RelatedSaveStrategy
+)
+
+
+class SshConfigMergerMixinCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.storage = ApplicationStorage(
+            Mock(**{
+                'app.directory_path': self.directory,
+                'config.get_safe.return_value': 'json',
+            }),
+            save_strategy=RelatedSaveStrategy,
+            get_strategy=RelatedGetStrategy,
+        )
+        self.merger = SshConfigMergerMixin()
+        self.merger.storage = self.storage
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_merged_ssh_config(self):
+        root = Group(label='root', ssh_config=SshConfig(
+            port=2022, timeout=10,
+            identity=Identity(username='root', is_visible=False),
+        ))
+        child = Group(
+            label='child', parent_group=root,
+            ssh_config=SshConfig(port=2222),
+        )
+        host = self.storage.save(Host(
+            label='host', address='localhost', group=child,
+            ssh_config=SshConfig(identity=Identity(
+                label='user', username='user', is_visible=True,
+            )),
+        ))
+
+        host = self.storage.get(Host, id=host.id)
+        child = host.group
+        ssh_config = self.merger.get_merged_ssh_config(host)
+        self.assertEqual(ssh_config.port, 2222)
+        self.assertEqual(ssh_config.timeout, 10)
+        self.assertEqual(ssh_config.identity.username, 'user')
+        self.assertIsNotNone(self.storage.identity_map.get_view(
+            self.merger.merged_stack_view, child.id
+        ))
+
+        child.ssh_config.port = None
+        self.storage.save(child.ssh_config)
+        self.assertIsNone(self.storage.identity_map.get_view(
+            self.merger.merged_stack_view, child.id
+        ))
+        group = self.storage.get(Group, id=child.id)
+        ssh_config = self.merger.get_merged_ssh_config(group)
+        self.assertEqual(ssh_config.port, 2022)
+        self.assertEqual(ssh_config.identity.username, 'root')
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
-from unittest import TestCase
+import copy
+import json
+from unittest import TestCase, skipIf
 
 import six
 from mock import patch, Mock
 
-from termius.core.models.base import Model
+from termius.core.models.base import Model, RemoteInstance
 from termius.core.models.terminal import (
     Tag, SshKey, Identity, SshConfig, Group, Host, PFRule
 )
@@ -75,3 +77,48 @@ class ModelsTest(TestCase):
 
         for model_class, expected_fields in expected_allowed_fields.items():
             assert sorted(model_class.allowed_fields()) == sorted(expected_fields)
+
+    def test_schema(self):
+        schema = Group.get_schema()
+        self.assertIs(schema, Group.get_schema())
+        self.assertEqual(
+            sorted(schema.fk_field_names), ['parent_group', 'ssh_config']
+        )
+        self.assertEqual(dict(schema.fk_fields)['parent_group'].model, Group)
+        self.assertEqual(schema.crypto_fields, {'label'})
+        self.assertEqual(SshConfig.get_schema().defaults['port'], None)
+        self.assertEqual(
+            Identity.get_schema().mergable_fields, {'username', 'ssh_key'}
+        )
+
+    def test_extra_fields_filtered(self):
+        host = Host(label='host', password='secret')
+        self.assertEqual(host, {'label': 'host', 'remote_instance': None})
+
+
+class CompactModelsTest(TestCase):
+
+    def make_payloads(self, count):
+        return json.loads(json.dumps([
+            {'id': i, 'port': 2022, 'charset': 'UTF-8', 'remote_instance': {
+                'id': i, 'state': 'synced', 'updated_at': None,
+            }} for i in range(count)
+        ]))
+
+    def test_no_instance_dict(self):
+        model = SshConfig(port=22, remote_instance={'id': 1})
+        with self.assertRaises(AttributeError):
+            object.__getattribute__(model, '__dict__')
+        self.assertIsInstance(model.remote_instance, RemoteInstance)
+        self.assertEqual(copy.copy(model), model)
+        self.assertEqual(json.loads(json.dumps(model)), {
+            'port': 22, 'remote_instance': {'id': 1}
+        })
+
+    @skipIf(six.PY2, 'unicode strings are not interned')
+    def test_interned_fields(self):
+        first, second = [SshConfig(**i) for i in self.make_payloads(2)]
+        self.assertIs(first.charset, second.charset)
+        self.assertIs(
+            first.remote_instance.state, second.remote_instance.state
+        )
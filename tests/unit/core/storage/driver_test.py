@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import shutil
+import tempfile
+from mock import patch
+from unittest import TestCase
+from termius.core.storage.driver import (
+    PersistentDict, JournalPersistentDict, SectionedPersistentDict
+)
+
+
+class PersistentDictCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'storage')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_skip_unchanged_sync(self):
+        driver = PersistentDict(self.filename)
+        driver.get('host_set')
+        driver.sync()
+        self.assertFalse(os.path.exists(self.filename))
+
+        with patch.object(PersistentDict, 'logger') as logger:
+            driver.append_record('host_set', {'id': 1})
+            driver.sync()
+        logger.debug.assert_called_once_with(
+            'Storage wrote %s bytes, flushed sets: %s.',
+            os.path.getsize(self.filename), 'host_set'
+        )
+
+        driver = PersistentDict(self.filename)
+        driver['host_set'][0]['label'] = 'not saved'
+        driver.sync()
+        self.assertEqual(PersistentDict(self.filename)['host_set'], [
+            {'id': 1}
+        ])
+
+    def test_replace_records(self):
+        driver = PersistentDict(self.filename)
+        records = [{'id': i} for i in range(3)]
+        driver.append_records('host_set', records)
+        driver.sync()
+
+        renamed = {'id': 1, 'label': 'renamed'}
+        driver.replace_records('host_set', [(records[1], renamed)])
+        self.assertIs(driver['host_set'][1], renamed)
+        driver.sync()
+        self.assertEqual(PersistentDict(self.filename)['host_set'], [
+            {'id': 0}, renamed, {'id': 2}
+        ])
+
+
+class JournalPersistentDictCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'storage')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open_dict(self):
+        return JournalPersistentDict(self.filename)
+
+    def fill(self, driver, count):
+        records = driver.setdefault('host_set', [])
+        for i in range(1, count + 1):
+            record = {'id': i, 'label': 'host{}'.format(i)}
+            records.append(record)
+            driver.mark_saved('host_set', record)
+        driver.sync()
+
+    def test_replay_changes(self):
+        driver = self.open_dict()
+        self.fill(driver, 3)
+
+        driver = self.open_dict()
+        records = driver['host_set']
+        deleted = records.pop(0)
+        driver.mark_deleted('host_set', deleted)
+        updated = records.pop(0)
+        updated = dict(updated, label='renamed')
+        records.append(updated)
+        driver.mark_saved('host_set', updated)
+        driver['delete_sets'] = {'host_set': [1]}
+        driver.sync()
+
+        driver = self.open_dict()
+        self.assertEqual(driver['host_set'], [
+            {'id': 3, 'label': 'host3'}, {'id': 2, 'label': 'renamed'}
+        ])
+        self.assertEqual(driver['delete_sets'], {'host_set': [1]})
+
+    @patch.object(JournalPersistentDict, 'compaction_ratio', 100)
+    def test_replay_replaced_records(self):
+        driver = self.open_dict()
+        self.fill(driver, 3)
+        driver.compact()
+
+        driver = self.open_dict()
+        renamed = dict(driver['host_set'][0], label='renamed')
+        driver.replace_records('host_set', [(driver['host_set'][0], renamed)])
+        driver.sync()
+        self.assertGreater(os.path.getsize(driver.journal_filename), 0)
+
+        self.assertEqual(
+            [i['label'] for i in self.open_dict()['host_set']],
+            ['renamed', 'host2', 'host3']
+        )
+
+    def test_replay_deleted_keys(self):
+        driver = self.open_dict()
+        self.fill(driver, 2)
+        driver['delete_sets'] = {'host_set': [1]}
+        driver.compact()
+
+        driver = self.open_dict()
+        del driver['delete_sets']
+        driver.sync()
+        self.assertGreater(os.path.getsize(driver.journal_filename), 0)
+        driver = self.open_dict()
+        self.assertNotIn('delete_sets', driver)
+        self.assertEqual(len(driver['host_set']), 2)
+
+        driver.clear()
+        driver['tag_set'] = []
+        driver.sync()
+        driver = self.open_dict()
+        self.assertEqual(list(driver.keys()), ['tag_set'])
+
+    def test_append_only_changes(self):
+        driver = self.open_dict()
+        self.fill(driver, 50)
+        snapshot_size = os.path.getsize(self.filename)
+
+        driver = self.open_dict()
+        record = dict(driver['host_set'].pop(), label='renamed')
+        driver['host_set'].append(record)
+        driver.mark_saved('host_set', record)
+        driver.sync()
+
+        self.assertEqual(os.path.getsize(self.filename), snapshot_size)
+        with open(driver.journal_filename) as journal:
+            entries = [json.loads(i) for i in journal]
+        self.assertEqual(entries, [{
+            'op': 'put', 'key': 'host_set', 'id': 50, 'record': record
+        }])
+
+    def test_compaction(self):
+        driver = self.open_dict()
+        self.fill(driver, 2)
+        self.assertEqual(os.path.getsize(driver.journal_filename), 0)
+
+        for i in range(10):
+            record = dict(driver['host_set'].pop(), label=str(i))
+            driver['host_set'].append(record)
+            driver.mark_saved('host_set', record)
+            driver.sync()
+        self.assertLess(
+            os.path.getsize(driver.journal_filename),
+            os.path.getsize(self.filename)
+        )
+        self.assertEqual(self.open_dict()['host_set'][-1]['label'], '9')
+
+    def test_torn_journal(self):
+        driver = self.open_dict()
+        self.fill(driver, 10)
+        with open(driver.journal_filename, 'a') as journal:
+            journal.write('{"op":"del","key":"host_set","id"')
+
+        driver = self.open_dict()
+        self.assertEqual(len(driver['host_set']), 10)
+        driver.sync()
+        self.assertEqual(os.path.getsize(driver.journal_filename), 0)
+        self.assertEqual(len(self.open_dict()['host_set']), 10)
+
+
+class SectionedPersistentDictCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'storage')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open_dict(self):
+        return SectionedPersistentDict(self.filename)
+
+    def test_lazy_sections(self):
+        driver = self.open_dict()
+        driver['host_set'] = [{'id': 1, 'label': u'host\u00e9'}]
+        driver['tag_set'] = [{'id': 2, 'label': 'tag'}]
+        driver['delete_sets'] = {}
+        driver.sync()
+
+        driver = self.open_dict()
+        self.assertEqual(
+            driver.stored_keys(), ['host_set', 'tag_set', 'delete_sets']
+        )
+        self.assertFalse(driver.is_loaded('host_set'))
+        host_section = driver.read_section('host_set')
+        driver.append_record('tag_set', {'id': 3, 'label': 'other'})
+        driver.sync()
+        self.assertFalse(driver.is_loaded('host_set'))
+        self.assertEqual(driver.read_section('host_set'), host_section)
+
+        driver = self.open_dict()
+        self.assertEqual(
+            driver['host_set'], [{'id': 1, 'label': u'host\u00e9'}]
+        )
+        self.assertEqual(len(driver['tag_set']), 2)
+        self.assertNotIn('snippet_set', driver)
+
+    def test_clear(self):
+        driver = self.open_dict()
+        driver['host_set'] = [{'id': 1}]
+        driver.sync()
+        driver.clear()
+        driver.sync()
+        self.assertEqual(self.open_dict().stored_keys(), [])
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import shutil
+import tempfile
+from mock import Mock, patch
+from unittest import TestCase
+from termius.core.models.terminal import Host
+from termius.core.storage import ApplicationStorage
+from termius.core.storage.idgenerators import SequenceGenerator
+
+
+FIRST_ID = 2 ** 20
+
+
+class SequenceGeneratorCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.first_id_patcher = patch.object(
+            SequenceGenerator, 'make_first_id', return_value=FIRST_ID
+        )
+        self.first_id_patcher.start()
+
+    def tearDown(self):
+        self.first_id_patcher.stop()
+        shutil.rmtree(self.directory)
+
+    def open_storage(self):
+        return ApplicationStorage(Mock(**{
+            'app.directory_path': self.directory,
+            'config.get_safe.return_value': 'json',
+        }))
+
+    def test_sequence_is_persisted(self):
+        first_id = FIRST_ID
+        with self.open_storage() as storage:
+            hosts = [storage.save(Host(label=str(i))) for i in range(3)]
+        self.assertEqual(
+            [i.id for i in hosts], [first_id, first_id + 1, first_id + 2]
+        )
+
+        with self.open_storage() as storage:
+            host = storage.save(Host(label='next'))
+        self.assertEqual(host.id, first_id + SequenceGenerator.block_size)
+
+    def test_used_ids_are_skipped(self):
+        first_id = FIRST_ID
+        storage = self.open_storage()
+        storage.low_set('host_set', [{'id': first_id, 'label': 'old'}])
+        host = storage.save(Host(label='new'))
+        self.assertEqual(host.id, first_id + 1)
+
+    def test_batch_reserves_single_block(self):
+        storage = self.open_storage()
+        storage.low_set = Mock(wraps=storage.low_set)
+        count = SequenceGenerator.block_size * 2 + 1
+        hosts = storage.save_many([Host(label=str(i)) for i in range(count)])
+        self.assertEqual(len(set(i.id for i in hosts)), count)
+        storage.low_set.assert_called_once_with(
+            SequenceGenerator.key, FIRST_ID + count
+        )
+
+    def test_sequence_starts_at_random_id(self):
+        self.first_id_patcher.stop()
+        try:
+            host = self.open_storage().save(Host(label='host'))
+        finally:
+            self.first_id_patcher.start()
+        self.assertGreaterEqual(host.id, SequenceGenerator.first_id_range[0])
+        self.assertLessEqual(host.id, SequenceGenerator.first_id_range[1])
@@ -36,6 +36,13 @@ class QueryCase(TestCase):
         self.assertFalse(query(self.first_mock))
         self.assertFalse(query(self.second_mock))
 
+    def test_gt_missing_values(self):
+        query = Query(**{'length.gt': 1})
+        self.assertFalse(query(Mock(length=None)))
+        self.assertFalse(query(Mock(length='long')))
+        self.assertFalse(query(Mock(spec=[])))
+        self.assertTrue(query(self.first_mock))
+
     def test_le(self):
         query = Query(**{'length.le': 0})
         self.assertFalse(query(self.first_mock))
@@ -50,3 +57,38 @@ class QueryCase(TestCase):
         query = Query(**{'length.lt': 0})
         self.assertFalse(query(self.first_mock))
         self.assertFalse(query(self.second_mock))
+
+    def test_all_union(self):
+        query = Query(**{'length.ge': 1, 'wind': 'short'})
+        self.assertTrue(query(self.first_mock))
+        self.assertFalse(query(self.second_mock))
+
+    def test_any_union(self):
+        query = Query(any, **{'length.ge': 1, 'wind': 'long'})
+        self.assertTrue(query(self.first_mock))
+        self.assertTrue(query(self.second_mock))
+        self.assertFalse(query(Mock(wind='short', length=0)))
+
+    def test_custom_union(self):
+        def none(results):
+            return not any(results)
+        query = Query(none, **{'length.ge': 1, 'wind': 'short'})
+        self.assertFalse(query(self.first_mock))
+        self.assertTrue(query(self.second_mock))
+
+    def test_glob(self):
+        query = Query(**{'wind.glob': 'sh*t'})
+        self.assertTrue(query(self.first_mock))
+        self.assertFalse(query(self.second_mock))
+
+    def test_regex(self):
+        query = Query(**{'wind.regex': '^l.n'})
+        self.assertFalse(query(self.first_mock))
+        self.assertTrue(query(self.second_mock))
+
+    def test_cidr(self):
+        query = Query(**{'address.cidr': '10.20.0.0/16'})
+        self.assertTrue(query(Mock(address='10.20.1.5')))
+        self.assertFalse(query(Mock(address='10.30.1.5')))
+        self.assertFalse(query(Mock(address='example.com')))
+        self.assertFalse(query(Mock(address='::1')))
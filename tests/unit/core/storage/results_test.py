@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import tempfile
+from mock import patch, Mock
+from unittest import TestCase
+from termius.core.models.terminal import Host
+from termius.core.storage.strategies import GetStrategy, SaveStrategy
+
+
+class ResultSetCase(TestCase):
+
+    def setUp(self):
+        self.tempfile = tempfile.NamedTemporaryFile()
+        self.storage_file_patch = patch(
+            'termius.core.storage.ApplicationStorage.path',
+            self.tempfile.name
+        )
+        self.storage_file_patch.start()
+
+        from termius.core.storage import ApplicationStorage
+
+        self.storage = ApplicationStorage(
+            Mock(**{'app.directory_path.return_value': 'TestCase'}),
+            save_strategy=SaveStrategy,
+            get_strategy=GetStrategy
+        )
+        self.storage.save_many([
+            Host(label='c', address='10.0.0.1'),
+            Host(label='a', address='10.0.0.3'),
+            Host(label='b', address='10.0.0.2'),
+            Host(label='d'),
+        ])
+        self.constructor = Mock(wraps=self.storage.model_constructor)
+        self.storage.model_constructor = self.constructor
+
+    def tearDown(self):
+        self.storage_file_patch.stop()
+        self.tempfile.close()
+
+    def labels(self, result_set):
+        return [i.label for i in result_set]
+
+    def test_lazy_page(self):
+        result_set = self.storage.query(Host).order_by('label')
+        page = result_set.offset(1).limit(2)
+        self.assertEqual(self.constructor.call_count, 0)
+        self.assertEqual(page.count(), 2)
+        self.assertEqual(self.labels(page), ['b', 'c'])
+        self.assertEqual(self.constructor.call_count, 2)
+        self.assertEqual(self.labels(result_set.limit(1).offset(5)), [])
+
+    def test_filtered_page(self):
+        result_set = self.storage.query(Host).exclude(address=None)
+        self.assertEqual(result_set.count(), 3)
+        self.assertEqual(
+            self.labels(result_set.order_by('-address').limit(2)), ['a', 'b']
+        )
+        self.assertEqual(
+            self.labels(result_set.filter(**{'label.ne': 'c'})), ['a', 'b']
+        )
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+from mock import Mock
+from unittest import TestCase
+from termius.core.models.terminal import Host
+from termius.core.storage import ApplicationStorage
+from termius.core.storage.query import Query
+from termius.core.storage.sqlite import SQLitePersistentDict
+
+
+class SQLitePersistentDictCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'storage')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open_dict(self):
+        return SQLitePersistentDict(self.filename)
+
+    def fill(self, driver, count):
+        for i in range(1, count + 1):
+            driver.append_record('host_set', {
+                'id': i, 'label': 'host{}'.format(i),
+                'group': i % 2 or None,
+                'remote_instance': {'id': i * 10},
+            })
+        driver.sync()
+
+    def test_records_changes(self):
+        driver = self.open_dict()
+        self.fill(driver, 3)
+        driver['delete_sets'] = {'host_set': [1]}
+        driver.sync()
+
+        driver = self.open_dict()
+        self.assertFalse(driver.is_loaded('host_set'))
+        self.assertEqual(
+            [i['id'] for i in driver.get('host_set')], [1, 2, 3]
+        )
+        driver.remove_record('host_set', driver['host_set'][0])
+        driver.append_record('host_set', {'id': 2, 'label': 'renamed'})
+        driver.sync()
+
+        driver = self.open_dict()
+        self.assertEqual(driver['host_set'], [
+            {'id': 3, 'label': 'host3', 'group': 1,
+             'remote_instance': {'id': 30}},
+            {'id': 2, 'label': 'renamed'},
+        ])
+        self.assertEqual(driver['delete_sets'], {'host_set': [1]})
+        self.assertEqual(
+            driver.stored_keys(), ['host_set', 'delete_sets']
+        )
+
+    def test_replace_records(self):
+        driver = self.open_dict()
+        self.fill(driver, 3)
+
+        driver = self.open_dict()
+        old = driver.lookup_records('host_set', 'id', 1)[0]
+        driver.replace_records('host_set', [(old, {'id': 1, 'label': 'a'})])
+        driver.sync()
+
+        driver = self.open_dict()
+        self.assertEqual(
+            [i['label'] for i in driver['host_set']], ['a', 'host2', 'host3']
+        )
+        self.assertEqual(
+            driver.lookup_records('host_set', 'label', 'a'), [
+                {'id': 1, 'label': 'a'}
+            ]
+        )
+
+    def test_select_records(self):
+        driver = self.open_dict()
+        self.fill(driver, 4)
+
+        driver = self.open_dict()
+        records = driver.select_records('host_set', Query(**{
+            'group.id': 1, 'label.ne': 'host3'
+        }))
+        self.assertEqual([i['id'] for i in records], [1, 3])
+        records = driver.select_records(
+            'host_set', Query(any, **{'id.rcontains': [2], 'group': None})
+        )
+        self.assertEqual([i['id'] for i in records], [2, 4])
+        self.assertFalse(driver.is_loaded('host_set'))
+
+        records = driver.select_records(
+            'host_set', Query(any, **{'id': 2, 'label.ne': 'host3'})
+        )
+        self.assertEqual(len(records), 4)
+        self.assertTrue(driver.is_loaded('host_set'))
+        self.assertIs(
+            records[0], driver.lookup_records('host_set', 'id', 1)[0]
+        )
+
+    def test_lookup_records(self):
+        driver = self.open_dict()
+        self.fill(driver, 2)
+
+        driver = self.open_dict()
+        records = driver.lookup_records('host_set', 'remote_instance.id', 20)
+        self.assertEqual([i['id'] for i in records], [2])
+        self.assertIsNone(driver.lookup_records('host_set', 'address', 'a'))
+
+    def test_clear(self):
+        driver = self.open_dict()
+        self.fill(driver, 2)
+        driver['delete_sets'] = {}
+        driver.clear()
+        driver.sync()
+
+        driver = self.open_dict()
+        self.assertNotIn('host_set', driver)
+        self.assertEqual(driver.stored_keys(), [])
+
+
+class MigrateCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_migrate(self):
+        storage = ApplicationStorage(Mock(**{
+            'app.directory_path': self.directory,
+            'config.get_safe.return_value': 'json',
+        }))
+        host = storage.save(Host(label='host', address='localhost'))
+        storage.save(Host(label='other', address='127.0.0.1'))
+        storage.migrate('sqlite')
+        self.assertIsInstance(storage.driver, SQLitePersistentDict)
+        self.assertEqual(
+            storage.get(Host, label='host').address, 'localhost'
+        )
+        storage.delete(host)
+        storage.migrate('json')
+        self.assertEqual(
+            [i.label for i in storage.get_all(Host)], ['other']
+        )
+
+
+class BackendsCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open_storage(self, driver_name):
+        directory = os.path.join(self.directory, driver_name)
+        if not os.path.isdir(directory):
+            os.mkdir(directory)
+        return ApplicationStorage(Mock(**{
+            'app.directory_path': directory,
+            'config.get_safe.return_value': driver_name,
+        }))
+
+    def test_same_query_results(self):
+        for driver_name in ('json', 'sqlite'):
+            storage = self.open_storage(driver_name)
+            with storage:
+                storage.save_many([
+                    Host(label=i, address='localhost')
+                    for i in ('host1', 'host12', 'host2', 'h')
+                ])
+
+        queries = (
+            {'label.rcontains': 'host12'},
+            {'label.rcontains': ['host1', 'h']},
+            {'label': 'host2'},
+            {'group': None, 'label.ne': 'h'},
+        )
+        for query in queries:
+            self.assertEqual(*[
+                [i.label for i in self.open_storage(j).filter(Host, **query)]
+                for j in ('json', 'sqlite')
+            ])
+        self.assertEqual(
+            [i.label for i in self.open_storage('sqlite').filter(
+                Host, **{'label.rcontains': 'host12'}
+            )],
+            ['host1', 'host12', 'h']
+        )
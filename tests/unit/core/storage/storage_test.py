@@ -4,11 +4,21 @@ from six import integer_types
 from mock import patch, Mock
 from unittest import TestCase
 from termius.core.models.terminal import (
-    Host, SshConfig, Identity, SshKey, Group
+    Host, SshConfig, Identity, SshKey, Group, Tag, TagHost
 )
-from termius.core.exceptions import DoesNotExistException
+from termius.core.models.base import RemoteInstance, Field, RESTRICT
+from termius.core.exceptions import (
+    DoesNotExistException, RestrictedDeleteException,
+    UniqueConstraintException
+)
+from termius.core.signals import (
+    post_create_instances, post_update_instance, post_delete_instances
+)
+from termius.core.storage.collector import GarbageCollector
+from termius.core.storage.sharing import SharedContentSplitter
 from termius.core.storage.strategies import (
-    GetStrategy, SaveStrategy, RelatedGetStrategy, RelatedSaveStrategy
+    GetStrategy, SaveStrategy, RelatedGetStrategy, RelatedSaveStrategy,
+    SyncSaveStrategy
 )
 
 
@@ -173,6 +183,498 @@ class IDStrategyCase(StrategyCase):
         self.assertEqual(got_host.group, saved_group.id)
 
 
+class LookupCase(StrategyCase):
+
+    save_strategy_class = SaveStrategy
+    get_strategy_class = GetStrategy
+
+    def setUp(self):
+        super(LookupCase, self).setUp()
+        self.group = Group(label='host_test')
+        self.host = Host(label='host_test')
+
+    def test_get_by_remote_id(self):
+        self.host.remote_instance = RemoteInstance(id=7)
+        saved_host = self.storage.save(self.host)
+
+        got_host = self.storage.get_by_remote_id(Host, 7)
+        self.assertEqual(got_host.id, saved_host.id)
+
+        self.host.remote_instance = RemoteInstance(id=8)
+        self.storage.save(self.host)
+        with self.assertRaises(DoesNotExistException):
+            self.storage.get_by_remote_id(Host, 7)
+        self.assertEqual(
+            self.storage.get_by_remote_id(Host, 8).id, saved_host.id
+        )
+
+        self.storage.delete(self.host)
+        with self.assertRaises(DoesNotExistException):
+            self.storage.get_by_remote_id(Host, 8)
+
+    def test_get_single_by_id(self):
+        saved_group = self.storage.save(self.group)
+        saved_host = self.storage.save(self.host)
+
+        got_group = self.storage.get_single_by_id(Group, saved_group.id)
+        self.assertEqual(got_group.label, self.group.label)
+
+        self.storage.delete(saved_group)
+        with self.assertRaises(DoesNotExistException):
+            self.storage.get_single_by_id(Group, saved_group.id)
+        self.assertEqual(
+            self.storage.get_single_by_id(Host, saved_host.id).id,
+            saved_host.id
+        )
+
+
+class BatchCase(StrategyCase):
+
+    save_strategy_class = SaveStrategy
+    get_strategy_class = GetStrategy
+
+    def test_save_many(self):
+        saved_host = self.storage.save(Host(label='existed'))
+        saved_host.label = 'renamed'
+        hosts = [Host(label='first'), saved_host, Host(label='second')]
+        receiver = Mock()
+        with post_create_instances.connected_to(receiver, sender=Host):
+            self.storage.save_many(hosts)
+
+        self.assertEqual(receiver.call_count, 1)
+        self.assertEqual(
+            [i.label for i in receiver.call_args[1]['instances']],
+            ['first', 'second']
+        )
+        self.assertTrue(all(i.id for i in hosts))
+        self.assertEqual(
+            [i.label for i in self.storage.get_all(Host)],
+            ['renamed', 'first', 'second']
+        )
+
+    def test_update_keeps_record_position(self):
+        hosts = [Host(label=str(i)) for i in range(3)]
+        self.storage.save_many(hosts)
+        host = self.storage.get(Host, label='0')
+        host.label = 'renamed'
+        self.storage.save(host)
+        self.assertEqual(
+            [i.label for i in self.storage.get_all(Host)],
+            ['renamed', '1', '2']
+        )
+        self.assertEqual(
+            [i.label for i in self.storage.filter(Host, label='renamed')],
+            ['renamed']
+        )
+        self.assertEqual(self.storage.filter(Host, label='0'), [])
+
+    def test_saved_record_is_snapshot(self):
+        tag = Tag(label='first')
+        self.storage.save(tag)
+        tag.label = 'not saved'
+        self.assertEqual(self.storage.get(Tag, id=tag.id).label, 'first')
+        self.assertEqual(self.storage.filter(Tag, label='not saved'), [])
+
+        saved_tag = self.storage.get_by_unique(Tag, label='first')
+        saved_tag.label = 'second'
+        self.storage.save(saved_tag)
+        self.assertEqual(
+            [i.label for i in self.storage.filter(Tag, label='second')],
+            ['second']
+        )
+        self.assertEqual(self.storage.filter(Tag, label='first'), [])
+
+        tag = Tag(label='synced', remote_instance=RemoteInstance(
+            id=1, state='synced'
+        ))
+        self.assertIs(self.storage.save(tag), tag)
+        self.storage.save(tag)
+        self.assertEqual(tag.remote_instance.state, 'updated')
+        self.assertEqual(
+            self.storage.get_by_remote_id(Tag, 1).remote_instance.state,
+            'updated'
+        )
+
+    def test_saved_model_is_copied_once(self):
+        hosts = [Host(label=str(i), address='localhost') for i in range(3)]
+        self.storage.save_many(hosts)
+        for i in hosts:
+            i.remote_instance = RemoteInstance(id=i.id)
+        copy = Host.copy
+        with patch.object(Host, 'copy', autospec=True,
+                          side_effect=copy) as host_copy, \
+                patch.object(RemoteInstance, 'copy') as remote_copy:
+            self.storage.save(hosts[0])
+            self.assertEqual(host_copy.call_count, 1)
+            self.storage.save_many(hosts)
+            self.assertEqual(host_copy.call_count, 4)
+        remote_copy.assert_not_called()
+
+    def test_delete_many(self):
+        hosts = [
+            Host(label='first'), Host(label='second'), Host(label='third')
+        ]
+        self.storage.save_many(hosts)
+        hosts[0].remote_instance = RemoteInstance(id=7)
+        self.storage.save(hosts[0])
+
+        self.storage.delete_many(hosts[:2])
+        self.storage.strategies.deleter.flush()
+        self.assertEqual(
+            [i.label for i in self.storage.get_all(Host)], ['third']
+        )
+        self.assertEqual(self.storage.low_get('delete_sets')['host_set'], [7])
+
+
+class IndexCase(StrategyCase):
+
+    save_strategy_class = SaveStrategy
+    get_strategy_class = GetStrategy
+
+    def test_filter_with_indexes(self):
+        group = self.storage.save(Group(label='group'))
+        hosts = [
+            Host(label='first', group=group.id, address='a'),
+            Host(label='second', address='a'),
+            Host(label='third', group=group.id, address='b'),
+        ]
+        self.storage.save_many(hosts)
+        self.storage.save(hosts[0])
+
+        query = {'group': group.id, 'address': 'a'}
+        self.assertEqual(
+            self.storage.planner.explain(Host, **query),
+            'index lookup host_set.group (eq)'
+        )
+        self.assertEqual(
+            [i.label for i in self.storage.filter(Host, **query)], ['first']
+        )
+        query = {'label.rcontains': ['third', 'first'], 'id': hosts[1].id}
+        explanation = self.storage.planner.explain(Host, any, **query)
+        self.assertTrue(explanation.startswith('index lookup'))
+        self.assertIn('host_set.label (rcontains)', explanation)
+        self.assertIn('host_set.id (eq)', explanation)
+        self.assertEqual(
+            [i.label for i in self.storage.filter(Host, any, **query)],
+            ['first', 'second', 'third']
+        )
+        query = {'label': 'first', 'address': 'a'}
+        self.assertEqual(
+            self.storage.planner.explain(Host, any, **query), 'scan host_set'
+        )
+        self.assertEqual(
+            [i.label for i in self.storage.filter(Host, any, **query)],
+            ['first', 'second']
+        )
+
+    def test_filter_with_interval_index(self):
+        hosts = [
+            Host(label='first', address='10.20.200.1'),
+            Host(label='second', address='example.com'),
+            Host(label='third', address='10.20.1.5'),
+            Host(label='fourth', address='10.30.0.1'),
+        ]
+        self.storage.save_many(hosts)
+        self.storage.save(hosts[2])
+
+        query = {'address.cidr': '10.20.0.0/16'}
+        self.assertEqual(
+            self.storage.planner.explain(Host, **query),
+            'index lookup host_set.address (cidr)'
+        )
+        self.assertEqual(
+            [i.label for i in self.storage.filter(Host, **query)],
+            ['first', 'third']
+        )
+        self.storage.delete(hosts[0])
+        self.assertEqual(
+            [i.label for i in self.storage.filter(Host, **query)], ['third']
+        )
+
+    def test_group_closure(self):
+        root = self.storage.save(Group(label='root'))
+        child = self.storage.save(Group(label='child', parent_group=root.id))
+        leaf = self.storage.save(Group(label='leaf', parent_group=child.id))
+        other = self.storage.save(Group(label='other'))
+
+        closure = self.storage.indexes.get_closure(
+            Group.set_name, 'parent_group'
+        )
+        self.assertEqual(closure.ancestors(leaf.id), [child.id, root.id])
+        self.assertEqual(closure.descendants(root.id), [child.id, leaf.id])
+
+        child = self.storage.get(Group, id=child.id)
+        child.parent_group = other.id
+        self.storage.save(child)
+        self.assertEqual(closure.ancestors(leaf.id), [child.id, other.id])
+        self.assertEqual(closure.descendants(root.id), [])
+        self.assertEqual(closure.descendants(other.id), [child.id, leaf.id])
+
+        self.storage.delete(child)
+        self.assertEqual(closure.ancestors(leaf.id), [])
+        self.assertEqual(closure.descendants(other.id), [])
+
+    def test_relation_index(self):
+        tags = self.storage.save_many([Tag(label='A'), Tag(label='B')])
+        hosts = self.storage.save_many([Host(label='1'), Host(label='2')])
+        taghosts = self.storage.save_many([
+            TagHost(tag=tags[0].id, host=hosts[0].id),
+            TagHost(tag=tags[1].id, host=hosts[0].id),
+            TagHost(tag=tags[1].id, host=hosts[1].id),
+        ])
+        tag_ids = [i.id for i in tags]
+
+        index = self.storage.indexes.get_relation_index(
+            TagHost.set_name, 'tag', 'host'
+        )
+        self.assertEqual(
+            index.lookup_any(tag_ids), {hosts[0].id, hosts[1].id}
+        )
+        self.assertEqual(index.lookup_all(tag_ids), {hosts[0].id})
+        self.storage.delete(taghosts[0])
+        self.assertEqual(index.lookup_all(tag_ids), set())
+        self.assertEqual(index.lookup_any([tags[0].id]), set())
+
+        self.assertEqual(self.storage.filter(Host, **{'id.rcontains': []}), [])
+
+
+class DeletePolicyCase(StrategyCase):
+
+    save_strategy_class = SaveStrategy
+    get_strategy_class = GetStrategy
+
+    def test_delete_policies(self):
+        group = self.storage.save(Group(label='group'))
+        host = self.storage.save(Host(label='host', group=group.id))
+        tag = self.storage.save(Tag(label='tag'))
+        self.storage.save(TagHost(host=host.id, tag=tag.id))
+        self.assertEqual(
+            [i.label for i in self.storage.referrers(group)], ['host']
+        )
+
+        self.storage.delete(group)
+        self.assertIsNone(self.storage.get(Host, id=host.id).group)
+        self.assertEqual(self.storage.referrers(group), [])
+
+        self.storage.delete(host)
+        self.assertEqual(self.storage.get_all(TagHost), [])
+        self.assertEqual(
+            [i.label for i in self.storage.get_all(Tag)], ['tag']
+        )
+
+    @patch.dict(TagHost.fields, tag=Field(Tag, False, None, RESTRICT))
+    def test_restrict_delete_policy(self):
+        tag = self.storage.save(Tag(label='tag'))
+        self.storage.save(TagHost(tag=tag.id))
+        with patch.dict('termius.core.models.base._SCHEMAS', clear=True), \
+                patch.dict('termius.core.models.base._REFERRERS', clear=True):
+            with self.assertRaises(RestrictedDeleteException):
+                self.storage.delete(tag)
+        self.assertEqual(len(self.storage.get_all(Tag)), 1)
+
+
+class DeleteSetsCase(StrategyCase):
+
+    save_strategy_class = SaveStrategy
+    get_strategy_class = GetStrategy
+
+    def test_truncate(self):
+        keys = [
+            SshKey(label=str(i), remote_instance=RemoteInstance(id=i))
+            for i in range(3)
+        ]
+        keys.append(SshKey(label='local'))
+        self.storage.save_many(keys)
+        tag = Tag(label='tag', remote_instance=RemoteInstance(id=5))
+        self.storage.save(tag)
+
+        receiver = Mock()
+        with post_delete_instances.connected_to(receiver, sender=SshKey):
+            self.storage.truncate(SshKey)
+        self.assertEqual(receiver.call_count, 1)
+        self.assertEqual(
+            [i.label for i in receiver.call_args[1]['instances']],
+            ['0', '1', '2', 'local']
+        )
+        self.assertEqual(self.storage.get_all(SshKey), [])
+        self.assertEqual(self.storage.filter(SshKey, label='0'), [])
+        self.storage.save(SshKey(label='0'))
+
+        self.storage.truncate(Tag, record_deletes=False)
+        self.assertEqual(self.storage.get_all(Tag), [])
+        self.assertEqual(
+            self.storage.strategies.deleter.get_delete_sets(),
+            {'sshkeycrypt_set': [0, 1, 2]}
+        )
+
+    def test_delete_sets_are_written_once(self):
+        hosts = [
+            Host(label=str(i), remote_instance=RemoteInstance(id=i))
+            for i in range(5)
+        ]
+        self.storage.save_many(hosts)
+        self.storage.low_set('delete_sets', {'host_set': [9, 3]})
+        low_set = self.storage.low_set
+        with patch.object(self.storage, 'low_set', wraps=low_set) as low_set:
+            for i in hosts:
+                self.storage.delete(i)
+            self.storage.confirm_delete({'host_set': [0, 9]})
+            self.storage.strategies.deleter.flush()
+            self.storage.strategies.deleter.flush()
+        low_set.assert_called_once_with(
+            'delete_sets', {'host_set': [1, 2, 3, 4]}
+        )
+        self.assertEqual(
+            self.storage.strategies.deleter.get_delete_sets(),
+            {'host_set': [1, 2, 3, 4]}
+        )
+
+
+class UniqueConstraintCase(StrategyCase):
+
+    save_strategy_class = SaveStrategy
+    get_strategy_class = GetStrategy
+
+    def test_unique_together(self):
+        tag = self.storage.save(Tag(label='tag'))
+        self.assertEqual(self.storage.get_by_unique(Tag, label='tag'), tag)
+        with self.assertRaises(DoesNotExistException):
+            self.storage.get_by_unique(Tag, label='other')
+        with self.assertRaises(ValueError):
+            self.storage.get_by_unique(Host, label='tag')
+        with self.assertRaises(UniqueConstraintException):
+            self.storage.save(Tag(label='tag'))
+        tag.label = 'renamed'
+        self.storage.save(tag)
+        self.storage.save(Tag(label='tag'))
+
+        group = self.storage.save(Group(label='group'))
+        host = self.storage.save(Host(label='host', group=group.id))
+        self.assertEqual(
+            self.storage.get_by_unique(Host, label='host', group=group), host
+        )
+        with self.assertRaises(UniqueConstraintException):
+            self.storage.save(Host(label='host', group=group))
+        self.storage.save(Host(label='host'))
+        self.storage.save(Host(label='host'))
+        self.storage.save(Host(address='localhost', group=group.id))
+        self.storage.save(Host(address='localhost', group=group.id))
+
+        keys = [SshKey(label='key'), SshKey(label='key')]
+        self.storage.save_many(keys)
+        self.assertEqual(
+            [i.id for i in self.storage.get_all(SshKey)], [keys[0].id]
+        )
+        self.assertIsNone(keys[1].id)
+
+    def test_unique_together_skipped_for_synced_models(self):
+        self.storage.save(Tag(label='tag'))
+        with patch.object(self.storage.strategies.saver,
+                          'is_unique_checked', False):
+            self.storage.save(Tag(label='tag'))
+        self.assertEqual(len(self.storage.filter(Tag, label='tag')), 2)
+
+    def test_unique_together_checked_on_change(self):
+        group = self.storage.save(Group(label='group'))
+        with patch.object(self.storage.strategies.saver,
+                          'is_unique_checked', False):
+            host = [
+                self.storage.save(Host(label='host', group=group.id))
+                for _ in range(2)
+            ][1]
+        host.address = 'localhost'
+        self.storage.save(host)
+        host.label = 'other'
+        self.storage.save(host)
+        host.label = 'host'
+        with self.assertRaises(UniqueConstraintException):
+            self.storage.save(host)
+        self.assertEqual(self.storage.get(Host, id=host.id).label, 'other')
+
+
+class RelatedUniqueConstraintCase(StrategyCase):
+
+    save_strategy_class = RelatedSaveStrategy
+    get_strategy_class = RelatedGetStrategy
+
+    def test_rejected_model_writes_no_relations(self):
+        group = self.storage.save(Group(label='group'))
+        self.storage.save(Host(label='host', group=group.id))
+        with self.assertRaises(UniqueConstraintException):
+            self.storage.save(Host(
+                label='host', group=group.id,
+                ssh_config=SshConfig(identity=Identity(username='a'))
+            ))
+        self.assertEqual(self.storage.get_all(SshConfig), [])
+        self.assertEqual(self.storage.get_all(Identity), [])
+
+        hosts = [
+            Host(label='host', group=group.id, ssh_config=SshConfig(port=2)),
+            Host(label='other', group=group.id, ssh_config=SshConfig(port=3)),
+        ]
+        self.storage.save_many(hosts)
+        self.assertIsNone(hosts[0].id)
+        self.assertEqual(
+            [i.label for i in self.storage.get_all(Host)], ['host', 'other']
+        )
+        self.assertEqual(
+            [i.port for i in self.storage.get_all(SshConfig)], [3]
+        )
+
+    def test_unsaved_relation_is_unique_key(self):
+        group = Group(label='group')
+        hosts = [Host(label='web', group=group) for _ in range(2)]
+        self.storage.save_many(hosts)
+        self.assertIsNone(hosts[1].id)
+        self.assertEqual(len(self.storage.get_all(Group)), 1)
+        self.assertEqual(
+            self.storage.get_by_unique(Host, label='web', group=group).id,
+            hosts[0].id
+        )
+
+        self.storage.save(Host(label='web', group=Group(label='other')))
+        with self.assertRaises(UniqueConstraintException):
+            self.storage.save(Host(label='web', group=group))
+        self.assertEqual(len(self.storage.get_all(Group)), 2)
+
+
+class GarbageCollectorCase(StrategyCase):
+
+    save_strategy_class = SaveStrategy
+    get_strategy_class = GetStrategy
+
+    def test_garbage_collector(self):
+        key = self.storage.save(SshKey(label='key'))
+        hidden = self.storage.save(Identity(username='a', ssh_key=key.id))
+        visible = self.storage.save(Identity(label='b', is_visible=True))
+        used = self.storage.save(SshConfig(port=2, identity=hidden.id))
+        orphan = SshConfig(port=3, identity=visible.id)
+        orphan.remote_instance = RemoteInstance(id=9)
+        orphan = self.storage.save(orphan)
+        lost = self.storage.save(Identity(username='c'))
+        self.storage.save(Group(label='group', ssh_config=used.id))
+
+        result = GarbageCollector(self.storage).sweep()
+        self.storage.strategies.deleter.flush()
+        self.assertEqual(
+            sorted((i.set_name, i.id) for i in result.models),
+            sorted([('sshconfig_set', orphan.id), ('identity_set', lost.id)])
+        )
+        self.assertGreater(result.size, 0)
+        self.assertEqual(
+            [i.id for i in self.storage.get_all(SshConfig)], [used.id]
+        )
+        self.assertEqual(
+            sorted(i.id for i in self.storage.get_all(Identity)),
+            sorted([hidden.id, visible.id])
+        )
+        self.assertEqual(len(self.storage.get_all(SshKey)), 1)
+        self.assertEqual(
+            self.storage.low_get('delete_sets')['sshconfig_set'], [9]
+        )
+        self.assertEqual(GarbageCollector(self.storage).sweep().models, [])
+
+
 class RelatedStrategyCase(StrategyCase):
 
     save_strategy_class = RelatedSaveStrategy
@@ -390,3 +892,138 @@ class RelatedStrategyCase(StrategyCase):
 
         self.assertIsNotNone(got_sshkey.id)
         self.assertEqual(got_sshkey.label, self.sshkey.label)
+
+
+class RelatedModelsCase(StrategyCase):
+
+    save_strategy_class = RelatedSaveStrategy
+    get_strategy_class = RelatedGetStrategy
+
+    def setUp(self):
+        super(RelatedModelsCase, self).setUp()
+        self.group = Group(label='host_test')
+        self.host = Host(label='host_test')
+
+    def test_get_shares_related_models(self):
+        self.host.group = self.group
+        self.storage.save(self.host)
+        self.storage.save(Host(label='other', group=self.host.group))
+
+        first_host, second_host = self.storage.get_all(Host)
+        self.assertIs(first_host.group, second_host.group)
+        self.assertEqual(self.storage.identity_map.hits, 1)
+
+        first_host.group.label = 'renamed'
+        self.storage.save(first_host.group)
+        got_hosts = self.storage.get_all(Host)
+        self.assertIsNot(got_hosts[0].group, first_host.group)
+        self.assertEqual(got_hosts[0].group.label, 'renamed')
+
+    def test_save_skips_unchanged_submodels(self):
+        key = SshKey(label='key', private_key='private')
+        key.remote_instance = RemoteInstance(id=3, state='synced')
+        self.storage.save(Host(label='host', group=Group(label='group'),
+                               ssh_config=SshConfig(identity=Identity(
+                                   label='identity', is_visible=True,
+                                   ssh_key=key
+                               ))))
+        host = self.storage.get(Host, label='host')
+        host.label = 'renamed'
+        receiver = Mock()
+        with post_update_instance.connected_to(receiver):
+            self.storage.save(host)
+        self.assertEqual(
+            [i[0][0] for i in receiver.call_args_list], [Host]
+        )
+        key = self.storage.get(SshKey, label='key')
+        self.assertEqual(key.remote_instance.state, 'synced')
+
+        host = self.storage.get(Host, label='renamed')
+        host.group.label = 'renamed'
+        with post_update_instance.connected_to(receiver):
+            self.storage.save(host)
+        self.assertEqual(
+            [i[0][0] for i in receiver.call_args_list[1:]], [Group, Host]
+        )
+
+
+class ContentSharingCase(StrategyCase):
+
+    save_strategy_class = RelatedSaveStrategy
+    get_strategy_class = RelatedGetStrategy
+
+    def get_ssh_configs(self, *labels):
+        return [self.storage.get(Host, label=i).ssh_config for i in labels]
+
+    def test_save_shares_ssh_configs_by_content(self):
+        for label in ('first', 'second'):
+            self.storage.save(Host(label=label, ssh_config=SshConfig(
+                port=2, identity=Identity(username='username')
+            )))
+        self.assertEqual(len(self.storage.get_all(SshConfig)), 1)
+        self.assertEqual(len(self.storage.get_all(Identity)), 1)
+
+        first_host = self.storage.get(Host, label='first')
+        first_host.ssh_config.port = 22
+        self.storage.save(first_host)
+        first, second = self.get_ssh_configs('first', 'second')
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual((first.port, second.port), (22, 2))
+        self.assertEqual(first.identity.id, second.identity.id)
+
+        second_host = self.storage.get(Host, label='second')
+        second_host.ssh_config.port = 22
+        self.storage.save(second_host)
+        first, second = self.get_ssh_configs('first', 'second')
+        self.assertEqual(first.id, second.id)
+
+    def test_save_does_not_share_visible_identities(self):
+        for label in ('first', 'second'):
+            self.storage.save(Host(label=label, ssh_config=SshConfig(
+                identity=Identity(
+                    label='identity', username='username', is_visible=True
+                )
+            )))
+        self.assertEqual(len(self.storage.get_all(SshConfig)), 2)
+        self.assertEqual(len(self.storage.get_all(Identity)), 2)
+
+    def test_save_does_not_share_synced_records(self):
+        self.storage.save(Host(label='first', ssh_config=SshConfig(
+            port=2, remote_instance=RemoteInstance(id=1)
+        )))
+        self.storage.save(Host(label='second', ssh_config=SshConfig(port=2)))
+        first, second = self.get_ssh_configs('first', 'second')
+        self.assertNotEqual(first.id, second.id)
+
+        self.storage.save(self.storage.get(Host, label='first'))
+        self.assertEqual(
+            self.get_ssh_configs('first')[0].remote_instance.id, 1
+        )
+
+    def test_split_shared_records(self):
+        for label in ('first', 'second', 'third'):
+            self.storage.save(Host(label=label, ssh_config=SshConfig(
+                port=2, identity=Identity(username='username')
+            )))
+        sync_saver = SyncSaveStrategy(self.storage)
+        self.storage.strategies = self.storage.strategies._replace(
+            saver=sync_saver
+        )
+        synced_host = self.storage.get(Host, label='third')
+        synced_host.remote_instance = RemoteInstance(id=1)
+        self.storage.save(synced_host)
+
+        updated = SharedContentSplitter(self.storage).split()
+        self.assertIs(self.storage.strategies.saver, sync_saver)
+        self.assertEqual(
+            sorted(i.set_name for i in updated),
+            ['host_set', 'host_set', 'sshconfig_set', 'sshconfig_set']
+        )
+        configs = self.get_ssh_configs('first', 'second', 'third')
+        self.assertEqual(len(set(i.id for i in configs)), 3)
+        self.assertEqual(len(set(i.identity.id for i in configs)), 3)
+        self.assertEqual(
+            self.storage.get(Host, label='third').remote_instance.state,
+            'updated'
+        )
+        self.assertEqual(SharedContentSplitter(self.storage).split(), [])